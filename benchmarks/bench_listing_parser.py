@@ -0,0 +1,239 @@
+"""
+Compares get_listing throughput with the previous delete_nulls based parser.
+
+    python -m benchmarks.bench_listing_parser [recorded_search_response.json ...]
+
+Without arguments, parses synthetic listings shaped like lexa search results.
+"""
+
+import json
+import re
+import sys
+import time
+
+from realestate_com_au.objects.listing import (
+    Inspection,
+    Lister,
+    Listing,
+    MediaItem,
+    get_listing,
+    parse_availability,
+    parse_description,
+    parse_phone,
+)
+from realestate_com_au.utils import delete_nulls
+
+
+def get_synthetic_listing(i):
+    return {
+        "id": str(140000000 + i),
+        "badge": {"label": "Under Contract"} if i % 7 == 0 else None,
+        "_links": {"canonical": {"href": f"https://www.realestate.com.au/{i}"}},
+        "address": {
+            "suburb": "Agnes Water",
+            "state": "Qld",
+            "postcode": "4677",
+            "display": {
+                "shortAddress": f"{i} Captain Cook Drive",
+                "fullAddress": f"{i} Captain Cook Drive, Agnes Water, Qld 4677",
+            },
+        },
+        "propertyType": {"id": "house", "display": "House"},
+        "listingCompany": {
+            "id": "ABCDEF",
+            "name": "Discovery Coast Realty",
+            "businessPhone": "07 4974 0000",
+        },
+        "generalFeatures": {
+            "bedrooms": {"value": 3},
+            "bathrooms": {"value": 2},
+            "parkingSpaces": {"value": 2},
+            "studies": None,
+        },
+        "propertySizes": {
+            "building": None,
+            "land": {"displayValue": "1,012", "sizeUnit": {"displayValue": "m²"}},
+            "preferred": None,
+        },
+        "price": {"display": "Offers over $1.2m" if i % 2 else "$650,000 - $700,000"},
+        "dateSold": None,
+        "auction": None,
+        "availableDate": None,
+        "description": "Coastal living at its best. " * 40,
+        "media": {
+            "mainImage": {
+                "templatedUrl": "https://i2.au.reastatic.net/{size}/main.jpg"
+            },
+            "images": [
+                {"templatedUrl": f"https://i2.au.reastatic.net/{{size}}/{n}.jpg"}
+                for n in range(20)
+            ],
+            "floorplans": [
+                {"templatedUrl": "https://i2.au.reastatic.net/{size}/fp.jpg"}
+            ],
+            "statementOfInformation": None,
+        },
+        "listers": [
+            {
+                "id": "1234",
+                "name": "Jane Agent",
+                "agentId": None,
+                "jobTitle": "Principal",
+                "_links": {
+                    "canonical": {"href": "https://www.realestate.com.au/agent/1234"}
+                },
+                "preferredPhoneNumber": "0400 000 000",
+                "email": None,
+            }
+        ],
+        "inspections": [
+            {
+                "startTime": "2024-09-07T10:00:00",
+                "endTime": "2024-09-07T10:30:00",
+                "display": {"longLabel": "Saturday 7 Sep", "shortLabel": "Sat 7 Sep"},
+            }
+        ],
+    }
+
+
+def load_recorded_listings(paths):
+    listings = []
+    for path in paths:
+        with open(path) as f:
+            data = json.load(f)
+        for search in data.get("data", {}).values():
+            results = search.get("results", {})
+            for group in ("exact", "surrounding"):
+                for item in (results.get(group) or {}).get("items", []):
+                    listings.append(item.get("listing") or {})
+    return listings
+
+
+def baseline_parse_price_text(price_display_text):
+    regex = r".*\$([0-9\,\.]+(?:k|K|m|M)*).*"
+    price_groups = re.search(regex, price_display_text)
+    price_text = (
+        price_groups.groups()[0] if price_groups and price_groups.groups() else None
+    )
+    if price_text is None:
+        return None
+    if price_text[-1] in "kK":
+        return int(float(price_text[:-1].replace(",", "")) * 1000)
+    if price_text[-1] in "mM":
+        return int(float(price_text[:-1].replace(",", "")) * 1000000)
+    return int(float(price_text.replace(",", "").split(".")[0]))
+
+
+def baseline_get_listing(listing):
+    """The parser as it was before the single-pass rewrite."""
+    listing = delete_nulls(listing)
+    address = listing.get("address", {})
+    listing_company = listing.get("listingCompany", {})
+    features = listing.get("generalFeatures", {})
+    property_sizes = listing.get("propertySizes", {})
+    price_text = listing.get("price", {}).get("display", "")
+
+    def get_lister(lister):
+        lister = delete_nulls(lister)
+        return Lister(
+            id=lister.get("id"),
+            name=lister.get("name"),
+            agent_id=lister.get("agentId"),
+            job_title=lister.get("jobTitle"),
+            url=lister.get("_links", {}).get("canonical", {}).get("href"),
+            phone=parse_phone(lister.get("preferredPhoneNumber")),
+            email=lister.get("email"),
+        )
+
+    def get_inspection(inspection):
+        inspection = delete_nulls(inspection)
+        return Inspection(
+            start_time=inspection.get("startTime"),
+            end_time=inspection.get("endTime"),
+            label=inspection.get("display", []).get("longLabel"),
+            label_short=inspection.get("display", []).get("shortLabel"),
+        )
+
+    def get_image(media):
+        return MediaItem(
+            link=media.get("templatedUrl", {}).replace("{size}", "1144x888-format=webp")
+        )
+
+    return Listing(
+        id=listing.get("id"),
+        badge=listing.get("badge", {}).get("label"),
+        url=listing.get("_links", {}).get("canonical", {}).get("href"),
+        suburb=address.get("suburb"),
+        state=address.get("state"),
+        postcode=address.get("postcode"),
+        short_address=address.get("display", {}).get("shortAddress"),
+        full_address=address.get("display", {}).get("fullAddress"),
+        property_type=listing.get("propertyType", {}).get("id"),
+        listing_company_id=listing_company.get("id"),
+        listing_company_name=listing_company.get("name"),
+        listing_company_phone=parse_phone(listing_company.get("businessPhone")),
+        bedrooms=features.get("bedrooms", {}).get("value"),
+        bathrooms=features.get("bathrooms", {}).get("value"),
+        parking_spaces=features.get("parkingSpaces", {}).get("value"),
+        building_size=property_sizes.get("building", {}).get("displayValue"),
+        building_size_unit=property_sizes.get("building", {})
+        .get("sizeUnit", {})
+        .get("displayValue"),
+        land_size=float(
+            "".join(property_sizes.get("land", {}).get("displayValue", "-1").split(","))
+        ),
+        land_size_unit=property_sizes.get("land", {})
+        .get("sizeUnit", {})
+        .get("displayValue"),
+        price=baseline_parse_price_text(price_text),
+        price_text=listing.get("price", {}).get("display"),
+        auction_date=(listing.get("auction", {}) or {})
+        .get("dateTime", {})
+        .get("value"),
+        available_date=parse_availability(
+            listing.get("availableDate", {}).get("display")
+        ),
+        sold_date=listing.get("dateSold", {}).get("display"),
+        description=parse_description(listing.get("description")),
+        statement_of_information=listing.get("media", [])
+        .get("statementOfInformation", {})
+        .get("href"),
+        images=[get_image(m) for m in listing.get("media", []).get("images", [])],
+        images_floorplans=[
+            get_image(m) for m in listing.get("media", []).get("floorplans", [])
+        ],
+        listers=[get_lister(lister) for lister in listing.get("listers", [])],
+        inspections=[get_inspection(i) for i in listing.get("inspections", [])],
+    )
+
+
+def measure(parse, listings, rounds=5):
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for listing in listings:
+            parse(listing)
+        best = min(best, time.perf_counter() - start)
+    return len(listings) / best
+
+
+def main(paths):
+    listings = (
+        load_recorded_listings(paths)
+        if paths
+        else [get_synthetic_listing(i) for i in range(10000)]
+    )
+    assert [baseline_get_listing(l) for l in listings[:100]] == [
+        get_listing(l) for l in listings[:100]
+    ]
+
+    baseline = measure(baseline_get_listing, listings)
+    current = measure(get_listing, listings)
+    print(f"{len(listings)} listings")
+    print(f"baseline get_listing: {baseline:>10,.0f} listings/sec")
+    print(f"current get_listing:  {current:>10,.0f} listings/sec")
+    print(f"speedup:              {current / baseline:>10.2f}x")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
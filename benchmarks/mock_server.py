@@ -0,0 +1,160 @@
+"""
+Local stand-in for the lexa GraphQL endpoint, serving synthetic or recorded
+buySearch/rentSearch/soldSearch pages so searches can be benchmarked offline.
+
+    with MockLexaServer(pages=40, latency=0.02) as server:
+        api = RealestateComAu(base_url=server.url)
+        api.search(workers=8)
+"""
+
+import json
+import random
+import threading
+import time
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from benchmarks.bench_listing_parser import get_synthetic_listing
+from realestate_com_au.query import DEFAULT_SEARCH_PAGE_SIZE
+
+
+class MockLexaServer:
+    """
+    Serves `pages` pages of results to any channel. Each response is delayed by
+    `latency` seconds, and a fraction `error_rate` of requests fail with
+    `error_status` (429 responses carry Retry-After: 0). `listings` (raw listing
+    dicts, e.g. from benchmarks.bench_listing_parser.load_recorded_listings) are
+    served in order instead of synthetic ones, repeating as needed. Persisted query
+    hashes are only accepted once their document has been sent.
+    """
+
+    def __init__(
+        self,
+        pages=10,
+        latency=0,
+        error_rate=0,
+        error_status=429,
+        listings=None,
+        seed=0,
+    ):
+        self.pages = pages
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.listings = listings
+        self.requests = 0
+        self.errors = 0
+        self._random = random.Random(seed)
+        self._persisted_hashes = set()
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._get_handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address
+        return f"http://{host}:{port}/graphql"
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def get_listing(self, i):
+        if self.listings:
+            return self.listings[i % len(self.listings)]
+        return get_synthetic_listing(i)
+
+    @lru_cache(maxsize=1024)
+    def get_page_body(self, channel, page, page_size):
+        start = (page - 1) * page_size
+        items = (
+            [{"listing": self.get_listing(i)} for i in range(start, start + page_size)]
+            if page <= self.pages
+            else []
+        )
+        data = {
+            "data": {
+                f"{channel}Search": {
+                    "results": {
+                        "totalResultsCount": self.pages * page_size,
+                        "pagination": {
+                            "page": page,
+                            "pageSize": page_size,
+                            "maxPageNumberAvailable": self.pages,
+                            "moreResultsAvailable": page < self.pages,
+                        },
+                        "exact": {"items": items},
+                        "surrounding": None,
+                    }
+                }
+            }
+        }
+        return json.dumps(data).encode()
+
+    def respond(self, payload):
+        """Returns (status, headers, body) for a decoded request payload."""
+        with self._lock:
+            self.requests += 1
+            failed = self._random.random() < self.error_rate
+            if failed:
+                self.errors += 1
+        if self.latency:
+            time.sleep(self.latency)
+        if failed:
+            headers = {"retry-after": "0"} if self.error_status == 429 else {}
+            return self.error_status, headers, b'{"errors": [{"message": "error"}]}'
+
+        persisted_query = (payload.get("extensions") or {}).get("persistedQuery")
+        if persisted_query:
+            with self._lock:
+                if "query" in payload:
+                    self._persisted_hashes.add(persisted_query["sha256Hash"])
+                elif persisted_query["sha256Hash"] not in self._persisted_hashes:
+                    body = {"errors": [{"message": "PersistedQueryNotFound"}]}
+                    return 200, {}, json.dumps(body).encode()
+
+        variables = json.loads(payload["variables"]["query"])
+        # Like lexa, unbounded searches (pageSize -1) get the default page size
+        page_size = variables["pageSize"]
+        if page_size < 1:
+            page_size = DEFAULT_SEARCH_PAGE_SIZE
+        body = self.get_page_body(variables["channel"], variables["page"], page_size)
+        return 200, {}, body
+
+    def _get_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                length = int(self.headers.get("content-length", 0))
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                if "/contact-agent/" in self.path:
+                    status, headers, body = 201, {}, b"{}"
+                else:
+                    status, headers, body = server.respond(payload)
+                self.send_response(status)
+                self.send_header("content-type", "application/json")
+                self.send_header("content-length", str(len(body)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
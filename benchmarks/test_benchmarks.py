@@ -0,0 +1,182 @@
+"""
+Offline performance suite, run against MockLexaServer:
+
+    python -m pytest benchmarks --benchmark-group-by=func
+
+Throughputs are recorded in each benchmark's extra_info. Pass --benchmark-autosave
+and later --benchmark-compare --benchmark-compare-fail=mean:10% to fail on
+regressions against a saved run.
+"""
+
+import json
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from benchmarks.bench_listing_parser import get_synthetic_listing
+from benchmarks.mock_server import MockLexaServer
+from realestate_com_au import RealestateComAu
+from realestate_com_au.json_backends import get_json_backend
+from realestate_com_au.objects.listing import LazyListing, get_listing
+from realestate_com_au.query import SearchQuery
+from realestate_com_au.scheduler import RequestScheduler
+
+PAGES = 20
+PAGE_SIZE = 25
+# Memory budget per parsed listing, with headroom over the current ~6.4KB
+MAX_BYTES_PER_LISTING = 10000
+# A cold start: import, construct a client and build one search request
+COLD_START = """
+import realestate_com_au
+from realestate_com_au.query import SearchQuery
+
+realestate_com_au.RealestateComAu()
+SearchQuery(channel="buy").get_payload(1)
+"""
+
+
+def get_client(server):
+    # The scheduler replaces the default 2-5s evasion delay between pages
+    scheduler = RequestScheduler(rate=100000, burst=100000, backoff=0, user_agents=None)
+    return RealestateComAu(base_url=server.url, scheduler=scheduler)
+
+
+def record_throughput(benchmark, name, count):
+    if benchmark.stats is None:  # --benchmark-disable
+        return
+    benchmark.extra_info[name] = round(count / benchmark.stats.stats.mean)
+
+
+@pytest.fixture(scope="module")
+def server():
+    with MockLexaServer(pages=PAGES) as server:
+        yield server
+
+
+@pytest.mark.parametrize("workers", [1, 8])
+def test_search_pages_per_second(benchmark, server, workers):
+    api = get_client(server)
+    listings = benchmark.pedantic(
+        api.search, kwargs={"workers": workers}, rounds=5, warmup_rounds=1
+    )
+    assert len(listings) == PAGES * PAGE_SIZE
+    record_throughput(benchmark, "pages_per_second", PAGES)
+
+
+def test_search_with_errors(benchmark):
+    # Seeded so that even a single run (--benchmark-disable) hits errors
+    with MockLexaServer(pages=PAGES, error_rate=0.1, seed=3) as server:
+        api = get_client(server)
+        listings = benchmark.pedantic(
+            api.search, kwargs={"workers": 4}, rounds=5, warmup_rounds=1
+        )
+        assert server.errors
+    assert len(listings) == PAGES * PAGE_SIZE
+    record_throughput(benchmark, "pages_per_second", PAGES)
+
+
+@pytest.mark.parametrize("workers", [1, 4, 16])
+def test_concurrency_scaling(benchmark, workers):
+    with MockLexaServer(pages=16, latency=0.02) as server:
+        api = get_client(server)
+        benchmark.pedantic(api.search, kwargs={"workers": workers}, rounds=3)
+    record_throughput(benchmark, "pages_per_second", 16)
+
+
+def test_concurrency_speedup():
+    with MockLexaServer(pages=16, latency=0.02) as server:
+        api = get_client(server)
+        elapsed = {1: float("inf"), 8: float("inf")}
+        for _ in range(3):
+            for workers in elapsed:
+                start = time.perf_counter()
+                api.search(workers=workers)
+                elapsed[workers] = min(elapsed[workers], time.perf_counter() - start)
+    assert elapsed[8] < elapsed[1] / 2
+
+
+@pytest.mark.parametrize("parse_processes", [None, 4])
+def test_search_batches_parse_processes(benchmark, server, parse_processes):
+    api = get_client(server)
+
+    def run():
+        return sum(
+            len(batch)
+            for batch in api.search_batches(workers=8, parse_processes=parse_processes)
+        )
+
+    assert benchmark.pedantic(run, rounds=3) == PAGES * PAGE_SIZE
+    record_throughput(benchmark, "pages_per_second", PAGES)
+
+
+def test_get_listing_listings_per_second(benchmark):
+    listings = [get_synthetic_listing(i) for i in range(1000)]
+    benchmark(lambda: [get_listing(listing) for listing in listings])
+    record_throughput(benchmark, "listings_per_second", len(listings))
+
+
+@pytest.mark.parametrize("backend", ["json", "orjson", "msgspec"])
+def test_decode_page(benchmark, backend):
+    pytest.importorskip(backend)
+    loads = get_json_backend(backend).loads
+    body = MockLexaServer(pages=1).get_page_body("buy", 1, 100)
+    benchmark(loads, body)
+    record_throughput(benchmark, "pages_per_second", 1)
+
+
+def test_lazy_listing_narrow_read_listings_per_second(benchmark):
+    listings = [get_synthetic_listing(i) for i in range(1000)]
+
+    def run():
+        for raw in listings:
+            listing = LazyListing(raw)
+            listing.id, listing.price, listing.suburb, listing.bedrooms
+
+    benchmark(run)
+    record_throughput(benchmark, "listings_per_second", len(listings))
+
+
+def test_exclude_keywords_parse_items(benchmark):
+    terms = [f"term{i}" for i in range(300)] + ["Coastal living at its worst"]
+    query = SearchQuery(exclude_keywords=terms, exclude_ignore_case=True)
+    data = json.loads(MockLexaServer(pages=1).get_page_body("buy", 1, 100))
+    assert len(benchmark(query.parse_items, data)) == 100
+    record_throughput(benchmark, "pages_per_second", 1)
+
+
+def test_memory_per_10k_listings(benchmark):
+    raw_listings = [get_synthetic_listing(i) for i in range(10000)]
+
+    def parse():
+        tracemalloc.start()
+        try:
+            listings = [get_listing(listing) for listing in raw_listings]
+            return tracemalloc.get_traced_memory()[0], listings
+        finally:
+            tracemalloc.stop()
+
+    traced_bytes, listings = benchmark.pedantic(parse, rounds=1)
+    bytes_per_listing = traced_bytes / len(listings)
+    benchmark.extra_info["bytes_per_listing"] = round(bytes_per_listing)
+    assert bytes_per_listing < MAX_BYTES_PER_LISTING
+
+
+def test_cold_start(benchmark):
+    def run(code):
+        subprocess.run([sys.executable, "-c", code], check=True)
+
+    start = time.perf_counter()
+    run("pass")
+    interpreter_seconds = time.perf_counter() - start
+
+    benchmark.pedantic(run, args=(COLD_START,), rounds=10, warmup_rounds=1)
+    if benchmark.stats is None:  # --benchmark-disable
+        return
+    benchmark.extra_info["ms_over_bare_interpreter"] = round(
+        (benchmark.stats.stats.mean - interpreter_seconds) * 1000
+    )
@@ -0,0 +1,12 @@
+from benchmarks.mock_server import MockLexaServer
+from realestate_com_au import RealestateComAu
+from realestate_com_au.scheduler import RequestScheduler
+
+
+def test_search_against_mock_server():
+    scheduler = RequestScheduler(rate=1000, burst=1000, backoff=0, user_agents=None)
+    with MockLexaServer(pages=4, error_rate=0.2, seed=1) as server:
+        api = RealestateComAu(base_url=server.url, scheduler=scheduler)
+        listings = api.search(workers=2, persisted_query=True)
+        assert server.errors
+    assert len({listing.id for listing in listings}) == 100
@@ -2,6 +2,25 @@
     realestate-com-au-api
 """
 
-from .realestate_com_au import RealestateComAu
+from importlib import import_module
 
-__all__ = ["RealestateComAu"]
+__all__ = ["RealestateComAu", "AsyncRealestateComAu"]
+
+# Clients are imported on first access, so importing a submodule such as
+# realestate_com_au.objects.listing does not load them.
+_CLIENT_MODULES = {
+    "RealestateComAu": ".realestate_com_au",
+    "AsyncRealestateComAu": ".async_realestate_com_au",
+}
+
+
+def __getattr__(name):
+    if name not in _CLIENT_MODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    client = getattr(import_module(_CLIENT_MODULES[name], __name__), name)
+    globals()[name] = client
+    return client
+
+
+def __dir__():
+    return sorted([*globals(), *__all__])
@@ -0,0 +1,200 @@
+"""
+Provides an asyncio realestate.com.au api client
+"""
+
+import asyncio
+import logging
+from time import perf_counter
+
+from realestate_com_au.json_backends import get_json_backend
+from realestate_com_au.metrics import NO_METRICS, FetchStats, parse_page
+from realestate_com_au.query import (
+    dedupe_listings,
+    get_contact_agent_payload,
+    get_search_query,
+)
+from realestate_com_au.realestate_com_au import RealestateComAu
+from realestate_com_au.utils import ClientLogger
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncRealestateComAu:
+    """
+    Class for accessing realestate.com.au API from asyncio code.
+    Requests share one pooled aiohttp session, capped at max_connections.
+    """
+
+    API_BASE_URL = RealestateComAu.API_BASE_URL
+    AGENT_CONTACT_BASE_URL = RealestateComAu.AGENT_CONTACT_BASE_URL
+    REQUEST_HEADERS = RealestateComAu.REQUEST_HEADERS
+
+    def __init__(
+        self,
+        proxy=None,
+        max_connections=100,
+        session=None,
+        debug=False,
+        cache=None,  # realestate_com_au.cache.ResponseCache
+        metrics=NO_METRICS,  # realestate_com_au.metrics.Metrics
+        json_backend=None,  # "json", "orjson" or "msgspec"; default: fastest installed
+        base_url=None,  # search endpoint, e.g. a local stand-in server
+    ):
+        self._proxy = proxy
+        self._base_url = base_url or self.API_BASE_URL
+        self._max_connections = max_connections
+        self._session = session
+        self._owns_session = session is None
+        self.cache = cache
+        self.metrics = metrics
+        self.json_backend = get_json_backend(json_backend)
+        self.logger = ClientLogger(logger, self, debug)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    @property
+    def session(self):
+        if self._session is None:
+            try:
+                import aiohttp
+            except ImportError as e:
+                raise ImportError(
+                    "AsyncRealestateComAu requires aiohttp: pip install aiohttp"
+                ) from e
+
+            self._session = aiohttp.ClientSession(
+                headers=self.REQUEST_HEADERS,
+                connector=aiohttp.TCPConnector(limit=self._max_connections),
+            )
+        return self._session
+
+    async def close(self):
+        if self._session is not None and self._owns_session:
+            await self._session.close()
+        self._session = None
+
+    async def _post(self, url, **kwargs):
+        async with self.session.post(url, proxy=self._proxy, **kwargs) as res:
+            return res.status, await res.read()
+
+    async def _fetch_page(self, query, page):
+        """
+        Returns the decoded response for one search page, from the cache when possible.
+        """
+        stats = FetchStats(query.channel, page)
+        cache_variables = query.get_cache_variables(page)
+        body = self.cache.get(cache_variables) if self.cache else None
+        if body is not None:
+            stats.cache_hit = True
+            stats.response_bytes = len(body)
+        else:
+            status, body = await self._post_payload(query.get_payload(page), stats)
+
+        start = perf_counter()
+        data = self.json_backend.loads(body)
+        stats.decode_seconds = perf_counter() - start
+        if not stats.cache_hit:
+            if query.persisted_query and query.is_persisted_query_miss(data):
+                stats.retries += 1
+                status, body = await self._post_payload(
+                    query.get_payload(page, send_document=True), stats
+                )
+                start = perf_counter()
+                data = self.json_backend.loads(body)
+                stats.decode_seconds += perf_counter() - start
+            if self.cache and status == 200:
+                self.cache.set(cache_variables, body)
+        self.metrics.page_fetched(stats)
+        return data
+
+    async def _post_payload(self, payload, stats):
+        request_body = self.json_backend.dumps(payload)
+        start = perf_counter()
+        status, body = await self._post(self._base_url, data=request_body)
+        stats.latency += perf_counter() - start
+        stats.request_bytes += len(request_body)
+        stats.response_bytes += len(body)
+        stats.status_code = status
+        self.logger.debug(
+            "%s page %s: HTTP %s, %s bytes in %.2fs",
+            stats.channel,
+            stats.page,
+            status,
+            len(body),
+            stats.latency,
+        )
+        return status, body
+
+    async def search(self, workers=1, **kwargs):
+        """
+        Accepts the same arguments as RealestateComAu.search except
+        requests_per_second and parse_processes. workers > 1 fetches the remaining
+        pages concurrently once page 1 reveals the page count.
+        """
+        query = get_search_query("search", **kwargs)
+
+        async def fetch_page(page):
+            return await self._fetch_page(query, page)
+
+        data = await fetch_page(1)
+        items = parse_page(self.metrics, query, data)
+        if query.is_done(len(items), data):
+            return items
+
+        page = 2
+        if workers > 1:
+            semaphore = asyncio.Semaphore(workers)
+
+            async def fetch_page_bounded(page):
+                async with semaphore:
+                    return await fetch_page(page)
+
+            while True:
+                pages = query.get_page_range(len(items), data, page)
+                if not pages:
+                    break
+                for page_data in await asyncio.gather(
+                    *(fetch_page_bounded(page) for page in pages)
+                ):
+                    items += parse_page(self.metrics, query, page_data)
+                page = pages[-1] + 1
+            return dedupe_listings(items)
+
+        while True:
+            data = await fetch_page(page)
+            items += parse_page(self.metrics, query, data)
+            if query.is_done(len(items), data):
+                return items
+            page += 1
+
+    """
+    Returns true if form was submitted successfully.
+    """
+
+    async def contact_agent(
+        self,
+        listing_id,
+        from_address,
+        from_name,
+        message,
+        subject="",
+        from_phone="",
+    ):
+        payload = get_contact_agent_payload(
+            from_address, from_name, message, subject=subject, from_phone=from_phone
+        )
+
+        status, body = await self._post(
+            f"{self.AGENT_CONTACT_BASE_URL}/contact-agent/listing/{listing_id}",
+            json=payload,
+        )
+
+        error = status != 201
+        if error:
+            print("Error: ", body.decode())
+
+        return not error
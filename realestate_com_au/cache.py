@@ -0,0 +1,144 @@
+"""
+Optional response cache for search pages
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+
+DEFAULT_TTLS = {
+    "buy": 60 * 60,
+    "rent": 60 * 60,
+    "sold": 7 * 24 * 60 * 60,  # sold results rarely change once published
+}
+
+
+class ResponseCache:
+    """
+    Two layer cache of raw search response bodies, keyed on a hash of the query
+    variables (which include channel and page).
+
+    An in-memory LRU of `memory_entries` bodies sits in front of an optional SQLite
+    file at `path` holding zlib compressed bodies. Entries expire after the TTL for
+    their channel, and the least recently used entries are evicted once the file
+    holds more than `max_bytes` of compressed bodies.
+    """
+
+    def __init__(
+        self,
+        path=None,
+        ttls=None,
+        max_bytes=256 * 1024 * 1024,
+        memory_entries=256,
+    ):
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.max_bytes = max_bytes
+        self.memory_entries = memory_entries
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, channel TEXT, body BLOB, size INTEGER, "
+                "expires REAL, accessed REAL)"
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)"
+            )
+            self._db.commit()
+
+    @staticmethod
+    def get_key(query_variables):
+        canonical = json.dumps(query_variables, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    def get(self, query_variables):
+        key = self.get_key(query_variables)
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expires, body = entry
+                if expires > now:
+                    self._memory.move_to_end(key)
+                    return body
+                del self._memory[key]
+
+            if self._db is None:
+                return None
+
+            row = self._db.execute(
+                "SELECT body, expires FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            compressed, expires = row
+            if expires <= now:
+                self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._db.commit()
+                return None
+            self._db.execute(
+                "UPDATE responses SET accessed = ? WHERE key = ?", (now, key)
+            )
+            self._db.commit()
+            body = zlib.decompress(compressed)
+            self._remember(key, expires, body)
+            return body
+
+    def set(self, query_variables, body):
+        key = self.get_key(query_variables)
+        now = time.time()
+        expires = now + self.ttls.get(query_variables.get("channel"), 0)
+        with self._lock:
+            self._remember(key, expires, body)
+            if self._db is None:
+                return
+
+            compressed = zlib.compress(body)
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    query_variables.get("channel"),
+                    compressed,
+                    len(compressed),
+                    expires,
+                    now,
+                ),
+            )
+            self._evict()
+            self._db.commit()
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM responses")
+                self._db.commit()
+
+    def _remember(self, key, expires, body):
+        self._memory[key] = (expires, body)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _evict(self):
+        self._db.execute("DELETE FROM responses WHERE expires <= ?", (time.time(),))
+        (total,) = self._db.execute("SELECT SUM(size) FROM responses").fetchone()
+        excess = (total or 0) - self.max_bytes
+        if excess <= 0:
+            return
+        evicted = 0
+        for key, size in self._db.execute(
+            "SELECT key, size FROM responses ORDER BY accessed"
+        ).fetchall():
+            if evicted >= excess:
+                break
+            self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+            evicted += size
@@ -0,0 +1,146 @@
+"""
+Writes search results to Parquet, NDJSON or CSV in bounded-memory chunks
+"""
+
+import csv
+import json
+import os
+import time
+from dataclasses import fields
+from itertools import islice
+
+from realestate_com_au.objects.listing import Inspection, Lister, Listing, MediaItem
+from realestate_com_au.objects.listing_batch import ListingBatch, get_arrow_schema
+from realestate_com_au.utils import import_optional
+
+NESTED_FIELDS = ("images", "images_floorplans", "listers", "inspections")
+
+
+def listing_to_dict(listing):
+    """
+    Plain dict of a Listing. Images become lists of links and listers/inspections
+    lists of dicts.
+    """
+    row = {f.name: getattr(listing, f.name) for f in fields(Listing)}
+    row["images"] = [image.link for image in listing.images]
+    row["images_floorplans"] = [image.link for image in listing.images_floorplans]
+    row["listers"] = [dict(lister.__dict__) for lister in listing.listers]
+    row["inspections"] = [dict(i.__dict__) for i in listing.inspections]
+    return row
+
+
+def listing_from_dict(row):
+    """
+    Inverse of listing_to_dict.
+    """
+    return Listing(
+        **{
+            **row,
+            "images": [MediaItem(link) for link in row["images"]],
+            "images_floorplans": [MediaItem(link) for link in row["images_floorplans"]],
+            "listers": [Lister(**lister) for lister in row["listers"]],
+            "inspections": [Inspection(**i) for i in row["inspections"]],
+        }
+    )
+
+
+class ParquetWriter:
+    """
+    Writes one row group per chunk with the schema from get_arrow_schema.
+    Parquet files cannot be appended to, so with append=True `path` is a dataset
+    directory and each writer adds a new part file to it.
+    """
+
+    def __init__(self, path, append=False, compression="zstd"):
+        pq = import_optional("pyarrow.parquet", "Parquet export", "parquet")
+
+        if append:
+            os.makedirs(path, exist_ok=True)
+            path = os.path.join(path, f"part-{time.time_ns()}.parquet")
+        self.path = path
+        self._writer = pq.ParquetWriter(
+            path, get_arrow_schema(), compression=compression
+        )
+
+    def write(self, listings):
+        self._writer.write_table(ListingBatch(listings).to_arrow())
+
+    def close(self):
+        self._writer.close()
+
+
+class NdjsonWriter:
+    def __init__(self, path, append=False):
+        self.path = path
+        self._file = open(path, "a" if append else "w", encoding="utf-8")
+
+    def write(self, listings):
+        self._file.writelines(
+            json.dumps(listing_to_dict(listing), ensure_ascii=False) + "\n"
+            for listing in listings
+        )
+
+    def close(self):
+        self._file.close()
+
+
+class CsvWriter:
+    """
+    Nested fields are written as JSON strings. In append mode the header is only
+    written to new or empty files.
+    """
+
+    def __init__(self, path, append=False):
+        self.path = path
+        write_header = not (append and os.path.exists(path) and os.path.getsize(path))
+        self._file = open(path, "a" if append else "w", encoding="utf-8", newline="")
+        self._writer = csv.DictWriter(
+            self._file, fieldnames=[f.name for f in fields(Listing)]
+        )
+        if write_header:
+            self._writer.writeheader()
+
+    def write(self, listings):
+        for listing in listings:
+            row = listing_to_dict(listing)
+            for name in NESTED_FIELDS:
+                row[name] = json.dumps(row[name], ensure_ascii=False)
+            self._writer.writerow(row)
+
+    def close(self):
+        self._file.close()
+
+
+WRITERS = {
+    "parquet": ParquetWriter,
+    "ndjson": NdjsonWriter,
+    "jsonl": NdjsonWriter,
+    "csv": CsvWriter,
+}
+
+
+def export_listings(listings, path, format=None, chunk_size=10000, append=False):
+    """
+    Writes listings (a list, or an iterator such as RealestateComAu.iter_search) to
+    `path` in chunks of chunk_size, so at most one chunk is held in memory.
+    `format` is "parquet", "ndjson" or "csv", inferred from the extension if not given.
+    Returns the number of listings written.
+    """
+    if format is None:
+        format = os.path.splitext(path)[1].lstrip(".").lower()
+    if format not in WRITERS:
+        raise ValueError(f"Unknown export format: {format}")
+
+    writer = WRITERS[format](path, append=append)
+    count = 0
+    try:
+        listings = iter(listings)
+        while True:
+            chunk = list(islice(listings, chunk_size))
+            if not chunk:
+                break
+            writer.write(chunk)
+            count += len(chunk)
+    finally:
+        writer.close()
+    return count
@@ -0,0 +1,14 @@
+"""
+Search documents per channel, imported on first use
+"""
+
+from functools import lru_cache
+from importlib import import_module
+
+DOCUMENT_MODULES = {"buy": "searchBuy", "rent": "searchRent", "sold": "searchSold"}
+
+
+@lru_cache(maxsize=None)
+def get_document(channel):
+    """The full search document for "buy", "rent" or "sold"."""
+    return import_module(f"{__name__}.{DOCUMENT_MODULES[channel]}").QUERY
@@ -0,0 +1,265 @@
+"""
+Builds trimmed search documents that only select the listing fields a caller needs.
+
+The trimmed document is a projection of the full searchBuy/searchRent/searchSold
+document: fragments are inlined with their type conditions and every selection not on
+a requested path is dropped, so whatever remains is valid against the same schema.
+"""
+
+import hashlib
+import re
+from functools import lru_cache
+
+from realestate_com_au.graphql import get_document
+
+TOKEN_PATTERN = re.compile(r'\.\.\.|[{}():!\[\]@$=]|"(?:[^"\\]|\\.)*"|-?[\d.]+|\w+')
+WORD_PATTERN = re.compile(r'[\w"\-]')
+
+# Selections kept under results regardless of the requested listing fields
+RESULTS_PATHS = ("totalResultsCount", "pagination")
+
+
+class _Parser:
+    def __init__(self, document):
+        self.tokens = TOKEN_PATTERN.findall(document)
+        self.position = 0
+
+    def peek(self):
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def next(self):
+        token = self.tokens[self.position]
+        self.position += 1
+        return token
+
+    def parse_document(self):
+        """Returns (operation header tokens, operation selections, fragments)."""
+        header, selections, fragments = None, None, {}
+        while self.peek() is not None:
+            if self.peek() == "fragment":
+                self.next()
+                name = self.next()
+                self.next()  # on
+                type_condition = self.next()
+                self.parse_directives()
+                fragments[name] = (type_condition, self.parse_selection_set())
+            else:
+                header = []
+                while self.peek() != "{":
+                    header.append(self.next())
+                selections = self.parse_selection_set()
+        return header, selections, fragments
+
+    def parse_balanced(self, opening, closing):
+        tokens = [self.next()]
+        depth = 1
+        while depth:
+            token = self.next()
+            depth += (token == opening) - (token == closing)
+            tokens.append(token)
+        return tokens
+
+    def parse_directives(self):
+        tokens = []
+        while self.peek() == "@":
+            tokens += [self.next(), self.next()]
+            if self.peek() == "(":
+                tokens += self.parse_balanced("(", ")")
+        return tokens
+
+    def parse_selection_set(self):
+        self.next()  # {
+        selections = []
+        while self.peek() != "}":
+            selections.append(self.parse_selection())
+        self.next()
+        return selections
+
+    def parse_selection(self):
+        if self.peek() == "...":
+            self.next()
+            if self.peek() == "on":
+                self.next()
+                type_condition = self.next()
+                directives = self.parse_directives()
+                return (
+                    "inline",
+                    type_condition,
+                    directives,
+                    self.parse_selection_set(),
+                )
+            if self.peek() in ("@", "{"):
+                directives = self.parse_directives()
+                return ("inline", None, directives, self.parse_selection_set())
+            name = self.next()
+            return ("spread", name, self.parse_directives())
+
+        alias, name = None, self.next()
+        if self.peek() == ":":
+            self.next()
+            alias, name = name, self.next()
+        arguments = self.parse_balanced("(", ")") if self.peek() == "(" else []
+        directives = self.parse_directives()
+        selections = self.parse_selection_set() if self.peek() == "{" else None
+        return ("field", alias, name, arguments, directives, selections)
+
+
+def get_path_tree(paths):
+    """("a.b", "a.c") -> {"a": {"b": {}, "c": {}}}. An empty dict keeps a whole field."""
+    tree = {}
+    for path in paths:
+        node = tree
+        for key in path.split("."):
+            node = node.setdefault(key, {})
+    return tree
+
+
+def prune(selections, tree, fragments):
+    """
+    Keeps the selections on paths in `tree`, or every selection when `tree` is None,
+    inlining fragment spreads. __typename is dropped everywhere, including inside
+    fields kept whole, as nothing reads it.
+    """
+    kept = []
+    for selection in selections:
+        kind = selection[0]
+        if kind == "field":
+            _, alias, name, arguments, directives, sub_selections = selection
+            key = alias or name
+            if name == "__typename" or (tree is not None and key not in tree):
+                continue
+            if sub_selections is None:
+                kept.append(selection)
+                continue
+            sub_tree = None if tree is None else tree[key] or None
+            pruned = prune(sub_selections, sub_tree, fragments)
+            if pruned:
+                kept.append(("field", alias, name, arguments, directives, pruned))
+        elif kind == "spread":
+            type_condition, fragment_selections = fragments[selection[1]]
+            pruned = prune(fragment_selections, tree, fragments)
+            if pruned:
+                kept.append(("inline", type_condition, selection[2], pruned))
+        else:
+            _, type_condition, directives, sub_selections = selection
+            pruned = prune(sub_selections, tree, fragments)
+            if pruned:
+                kept.append(("inline", type_condition, directives, pruned))
+    return kept
+
+
+def merge(selections, parent_type=None):
+    """
+    Collapses the nesting left by inlining fragments: inline fragments on the enclosing
+    type are spliced into it, and repeated fields and fragments on the same type are
+    merged into one selection.
+    """
+    groups = {}  # key -> [first selection, merged sub-selections]
+
+    def add(selection):
+        if selection[0] == "field":
+            _, alias, name, arguments, directives, sub_selections = selection
+            key = ("field", alias, name, tuple(arguments), tuple(directives))
+            group = groups.setdefault(
+                key, [selection, None if sub_selections is None else []]
+            )
+            if sub_selections is not None:
+                group[1] += sub_selections
+            return
+
+        _, type_condition, directives, sub_selections = selection
+        if not directives and type_condition in (None, parent_type):
+            for sub_selection in sub_selections:
+                add(sub_selection)
+            return
+        key = ("inline", type_condition, tuple(directives))
+        groups.setdefault(key, [selection, []])[1].extend(sub_selections)
+
+    for selection in selections:
+        add(selection)
+
+    merged = []
+    for selection, sub_selections in groups.values():
+        if selection[0] == "field":
+            if sub_selections is not None:
+                selection = selection[:5] + (merge(sub_selections),)
+        else:
+            _, type_condition, directives, _ = selection
+            selection = (
+                "inline",
+                type_condition,
+                directives,
+                merge(sub_selections, type_condition),
+            )
+        merged.append(selection)
+    return merged
+
+
+def print_selections(selections):
+    tokens = ["{"]
+    for selection in selections:
+        if selection[0] == "field":
+            _, alias, name, arguments, directives, sub_selections = selection
+            if alias:
+                tokens += [alias, ":"]
+            tokens += [name, *arguments, *directives]
+            if sub_selections is not None:
+                tokens += print_selections(sub_selections)
+        elif selection[0] == "spread":
+            tokens += ["...", selection[1], *selection[2]]
+        else:
+            _, type_condition, directives, sub_selections = selection
+            tokens.append("...")
+            if type_condition:
+                tokens += ["on", type_condition]
+            tokens += [*directives, *print_selections(sub_selections)]
+    tokens.append("}")
+    return tokens
+
+
+def join_tokens(tokens):
+    parts = []
+    previous = ""
+    for token in tokens:
+        if (
+            previous
+            and WORD_PATTERN.match(previous[-1])
+            and WORD_PATTERN.match(token[0])
+        ):
+            parts.append(" ")
+        parts.append(token)
+        previous = token
+    return "".join(parts)
+
+
+@lru_cache(maxsize=None)
+def parse_document(channel):
+    return _Parser(get_document(channel)).parse_document()
+
+
+@lru_cache(maxsize=128)
+def build_query(channel, listing_paths):
+    """
+    Search document for `channel` selecting only `listing_paths` (dotted paths within
+    a result listing, e.g. "address.suburb") plus the pagination fields.
+    """
+    header, selections, fragments = parse_document(channel)
+    listing_tree = get_path_tree(listing_paths)
+    items_tree = {"items": {"listing": listing_tree}}
+    tree = {
+        f"{channel}Search": {
+            "results": {
+                **get_path_tree(RESULTS_PATHS),
+                "exact": items_tree,
+                "surrounding": items_tree,
+            }
+        }
+    }
+    pruned = merge(prune(selections, tree, fragments))
+    return join_tokens(header + print_selections(pruned))
+
+
+@lru_cache(maxsize=128)
+def get_query_hash(query):
+    """sha256 of a document, as used by automatic persisted queries."""
+    return hashlib.sha256(query.encode()).hexdigest()
@@ -0,0 +1,87 @@
+"""
+Checkpointed search jobs that can be resumed after the process stops
+"""
+
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import asdict
+
+from realestate_com_au.query import SearchQuery
+
+
+class JobStore:
+    """
+    SQLite file recording each job's search, its last completed page and the listing
+    ids it has emitted.
+    """
+
+    def __init__(self, path):
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.executescript(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "id TEXT PRIMARY KEY, query TEXT, last_page INTEGER, items_count INTEGER, "
+            "done INTEGER, updated REAL);"
+            "CREATE TABLE IF NOT EXISTS emitted ("
+            "job_id TEXT, listing_id TEXT, PRIMARY KEY (job_id, listing_id));"
+        )
+        self._db.commit()
+
+    def create(self, query, job_id=None):
+        job_id = job_id or uuid.uuid4().hex
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO jobs VALUES (?, ?, 0, 0, 0, ?)",
+                (job_id, json.dumps(asdict(query)), time.time()),
+            )
+            self._db.commit()
+        return job_id
+
+    def get(self, job_id):
+        """Returns (query, last_page, items_count, done)."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT query, last_page, items_count, done FROM jobs WHERE id = ?",
+                (job_id,),
+            ).fetchone()
+        if row is None:
+            raise KeyError(f"No such job: {job_id}")
+        query_fields, last_page, items_count, done = row
+        query_fields = json.loads(query_fields)
+        if query_fields.get("fields"):
+            query_fields["fields"] = tuple(query_fields["fields"])
+        return SearchQuery(**query_fields), last_page, items_count, bool(done)
+
+    def get_emitted_ids(self, job_id):
+        with self._lock:
+            return {
+                listing_id
+                for (listing_id,) in self._db.execute(
+                    "SELECT listing_id FROM emitted WHERE job_id = ?", (job_id,)
+                )
+            }
+
+    def add_emitted_ids(self, job_id, listing_ids):
+        with self._lock:
+            self._insert_emitted_ids(job_id, listing_ids)
+            self._db.commit()
+
+    def checkpoint(self, job_id, page, items_count, listing_ids, done=False):
+        """Records a completed page and the ids emitted from it in one transaction."""
+        with self._lock:
+            self._insert_emitted_ids(job_id, listing_ids)
+            self._db.execute(
+                "UPDATE jobs SET last_page = ?, items_count = ?, done = ?, updated = ? "
+                "WHERE id = ?",
+                (page, items_count, int(done), time.time(), job_id),
+            )
+            self._db.commit()
+
+    def _insert_emitted_ids(self, job_id, listing_ids):
+        self._db.executemany(
+            "INSERT OR IGNORE INTO emitted VALUES (?, ?)",
+            [(job_id, listing_id) for listing_id in listing_ids],
+        )
@@ -0,0 +1,57 @@
+"""
+JSON backends for search request and response bodies: the standard library, or orjson
+or msgspec when installed
+"""
+
+import json
+from dataclasses import dataclass
+from typing import Callable
+
+from realestate_com_au.utils import import_optional
+
+# Preferred order when no backend is named
+AUTO_BACKENDS = ("orjson", "msgspec", "json")
+
+
+@dataclass(frozen=True)
+class JsonBackend:
+    name: str
+    loads: Callable  # bytes or str -> object
+    dumps: Callable  # object -> bytes
+
+
+def _get_json():
+    return JsonBackend("json", json.loads, lambda obj: json.dumps(obj).encode())
+
+
+def _get_orjson():
+    orjson = import_optional("orjson", "The orjson backend", "fast")
+
+    return JsonBackend("orjson", orjson.loads, orjson.dumps)
+
+
+def _get_msgspec():
+    msgspec = import_optional("msgspec", "The msgspec backend", "msgspec")
+
+    return JsonBackend(
+        "msgspec", msgspec.json.Decoder().decode, msgspec.json.Encoder().encode
+    )
+
+
+BACKENDS = {"json": _get_json, "orjson": _get_orjson, "msgspec": _get_msgspec}
+
+
+def get_json_backend(name=None):
+    """
+    Returns the JsonBackend called `name` ("json", "orjson" or "msgspec"), or with
+    name=None the first of AUTO_BACKENDS that is installed.
+    """
+    if name is None:
+        for name in AUTO_BACKENDS:
+            try:
+                return BACKENDS[name]()
+            except ImportError:
+                continue
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown JSON backend: {name}")
+    return BACKENDS[name]()
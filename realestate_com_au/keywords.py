@@ -0,0 +1,65 @@
+"""
+Keyword matching for exclude_keywords, compiled once per term set
+"""
+
+import re
+from functools import lru_cache
+
+
+def get_trie(terms):
+    """{"ab", "ac"} -> {"a": {"b": {"": {}}, "c": {"": {}}}}. "" marks a term's end."""
+    trie = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[""] = {}
+    return trie
+
+
+def get_trie_pattern(node):
+    """
+    Regex alternation of the terms in a trie, with shared prefixes factored out
+    ("pool|pools|porch" -> "po(?:ol(?:s)?|rch)"), so the regex engine tries each
+    prefix once instead of once per term.
+    """
+    alternatives = [
+        re.escape(char) + get_trie_pattern(child)
+        for char, child in sorted(node.items())
+        if char
+    ]
+    if not alternatives:
+        return ""
+    if "" in node:
+        return f"(?:{'|'.join(alternatives)})?"
+    if len(alternatives) == 1:
+        return alternatives[0]
+    return f"(?:{'|'.join(alternatives)})"
+
+
+class KeywordMatcher:
+    """
+    Finds any of `terms` in a text. Terms are literal text, not regexes. With
+    whole_words, a term only matches when it is not part of a longer word.
+    """
+
+    def __init__(self, terms, ignore_case=False, whole_words=False):
+        terms = {term.lower() if ignore_case else term for term in terms if term}
+        pattern = get_trie_pattern(get_trie(terms))
+        if whole_words:
+            pattern = rf"(?<!\w)(?:{pattern})(?!\w)"
+        self.pattern = re.compile(pattern, re.IGNORECASE if ignore_case else 0)
+
+    def search(self, text):
+        return text is not None and self.pattern.search(text) is not None
+
+
+@lru_cache(maxsize=64)
+def get_keyword_matcher(terms, ignore_case=False, whole_words=False):
+    """
+    KeywordMatcher for a tuple of terms, cached so each term set is compiled once per
+    process. Returns None when there are no terms.
+    """
+    if not any(terms):
+        return None
+    return KeywordMatcher(terms, ignore_case, whole_words)
@@ -0,0 +1,175 @@
+"""
+Instrumentation hooks for the search hot path: request latency, bytes, decode and
+parse time, listings parsed, retries and cache hits
+"""
+
+import time
+from dataclasses import dataclass
+
+
+@dataclass
+class FetchStats:
+    """One search page fetched from the server or the cache."""
+
+    channel: str
+    page: int
+    cache_hit: bool = False
+    status_code: int = None
+    latency: float = 0.0  # seconds spent sending requests, including their retries
+    request_bytes: int = 0
+    response_bytes: int = 0
+    decode_seconds: float = 0.0
+    retries: int = 0  # persisted query documents resent after a miss
+
+
+@dataclass
+class ParseStats:
+    """One search page parsed into Listings."""
+
+    channel: str
+    page: int
+    listings: int
+    parse_seconds: float
+
+
+class Metrics:
+    """
+    Receives instrumentation events. The base class ignores them all, so subclasses
+    only override the events they need.
+    """
+
+    def page_fetched(self, stats):
+        pass
+
+    def page_parsed(self, stats):
+        pass
+
+    def request_retried(self, url, attempt, reason):
+        """`reason` is the status code or exception that caused the retry."""
+        pass
+
+
+NO_METRICS = Metrics()
+
+
+def get_reason_label(reason):
+    """Low-cardinality label for a retry reason: the status code or exception type."""
+    return str(reason) if isinstance(reason, int) else type(reason).__name__
+
+
+def parse_page(metrics, query, data, listings_by_id=None):
+    """query.parse_items(data, listings_by_id), reporting a ParseStats to `metrics`."""
+    start = time.perf_counter()
+    items = query.parse_items(data, listings_by_id)
+    parse_seconds = time.perf_counter() - start
+    pagination = query.get_results(data).get("pagination") or {}
+    metrics.page_parsed(
+        ParseStats(query.channel, pagination.get("page"), len(items), parse_seconds)
+    )
+    return items
+
+
+class PrometheusMetrics(Metrics):
+    """
+    Records events as prometheus_client histograms and counters labelled by channel.
+    Requires prometheus_client.
+    """
+
+    def __init__(self, registry=None, namespace="realestate_com_au"):
+        from prometheus_client import REGISTRY, Counter, Histogram
+
+        registry = registry or REGISTRY
+        options = dict(namespace=namespace, labelnames=["channel"], registry=registry)
+        self.latency = Histogram(
+            "page_fetch_seconds", "Search page request latency", **options
+        )
+        self.decode_seconds = Histogram(
+            "page_decode_seconds", "Search page JSON decode time", **options
+        )
+        self.parse_seconds = Histogram(
+            "page_parse_seconds", "Search page listing parse time", **options
+        )
+        self.request_bytes = Counter(
+            "request_bytes", "Search request body bytes", **options
+        )
+        self.response_bytes = Counter(
+            "response_bytes", "Search response body bytes", **options
+        )
+        self.cache_hits = Counter(
+            "cache_hits", "Search pages served from cache", **options
+        )
+        self.listings = Counter("listings_parsed", "Listings parsed", **options)
+        self.retries = Counter(
+            "retries",
+            "Requests retried",
+            namespace=namespace,
+            labelnames=["reason"],
+            registry=registry,
+        )
+
+    def page_fetched(self, stats):
+        if stats.cache_hit:
+            self.cache_hits.labels(stats.channel).inc()
+        else:
+            self.latency.labels(stats.channel).observe(stats.latency)
+            self.request_bytes.labels(stats.channel).inc(stats.request_bytes)
+        self.response_bytes.labels(stats.channel).inc(stats.response_bytes)
+        self.decode_seconds.labels(stats.channel).observe(stats.decode_seconds)
+        if stats.retries:
+            self.retries.labels("persisted_query_miss").inc(stats.retries)
+
+    def page_parsed(self, stats):
+        self.parse_seconds.labels(stats.channel).observe(stats.parse_seconds)
+        self.listings.labels(stats.channel).inc(stats.listings)
+
+    def request_retried(self, url, attempt, reason):
+        self.retries.labels(get_reason_label(reason)).inc()
+
+
+class OpenTelemetryMetrics(Metrics):
+    """
+    Records events as OpenTelemetry histograms and counters with a channel attribute.
+    Requires opentelemetry-api; uses the global meter provider unless `meter` is given.
+    """
+
+    def __init__(self, meter=None):
+        if meter is None:
+            from opentelemetry import metrics
+
+            meter = metrics.get_meter("realestate_com_au")
+        self.latency = meter.create_histogram("realestate_com_au.page.fetch", unit="s")
+        self.decode_seconds = meter.create_histogram(
+            "realestate_com_au.page.decode", unit="s"
+        )
+        self.parse_seconds = meter.create_histogram(
+            "realestate_com_au.page.parse", unit="s"
+        )
+        self.request_bytes = meter.create_counter(
+            "realestate_com_au.request.size", unit="By"
+        )
+        self.response_bytes = meter.create_counter(
+            "realestate_com_au.response.size", unit="By"
+        )
+        self.cache_hits = meter.create_counter("realestate_com_au.cache.hits")
+        self.listings = meter.create_counter("realestate_com_au.listings.parsed")
+        self.retries = meter.create_counter("realestate_com_au.retries")
+
+    def page_fetched(self, stats):
+        attributes = {"channel": stats.channel}
+        if stats.cache_hit:
+            self.cache_hits.add(1, attributes)
+        else:
+            self.latency.record(stats.latency, attributes)
+            self.request_bytes.add(stats.request_bytes, attributes)
+        self.response_bytes.add(stats.response_bytes, attributes)
+        self.decode_seconds.record(stats.decode_seconds, attributes)
+        if stats.retries:
+            self.retries.add(stats.retries, {"reason": "persisted_query_miss"})
+
+    def page_parsed(self, stats):
+        attributes = {"channel": stats.channel}
+        self.parse_seconds.record(stats.parse_seconds, attributes)
+        self.listings.add(stats.listings, attributes)
+
+    def request_retried(self, url, attempt, reason):
+        self.retries.add(1, {"reason": get_reason_label(reason)})
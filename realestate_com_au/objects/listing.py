@@ -1,6 +1,6 @@
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields, make_dataclass
 import re
-from realestate_com_au.utils import delete_nulls
+import sys
 
 
 @dataclass
@@ -65,6 +65,140 @@ class Inspection:
     label_short: str
 
 
+def frozen_variant(cls):
+    """
+    Returns a slotted, immutable version of a dataclass, with list fields as tuples.
+    Slotted instances have no per-instance __dict__, which is most of their memory.
+    """
+    frozen_cls = make_dataclass(
+        f"Frozen{cls.__name__}",
+        [
+            (f.name, tuple, field(default=())) if f.type is list else (f.name, f.type)
+            for f in fields(cls)
+        ],
+        frozen=True,
+        slots=True,
+    )
+    frozen_cls.__module__ = cls.__module__  # so instances pickle
+    return frozen_cls
+
+
+# Frozen variants are built on first use (see __getattr__), as creating them is a
+# noticeable share of import time
+FROZEN_VARIANTS = {
+    "FrozenListing": Listing,
+    "FrozenLister": Lister,
+    "FrozenMediaItem": MediaItem,
+    "FrozenInspection": Inspection,
+}
+
+
+def __getattr__(name):
+    if name not in FROZEN_VARIANTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    frozen_cls = frozen_variant(FROZEN_VARIANTS[name])
+    globals()[name] = frozen_cls
+    return frozen_cls
+
+
+def freeze_listing(listing):
+    module = sys.modules[__name__]
+    media_item = module.FrozenMediaItem
+    return module.FrozenListing(
+        **{
+            f.name: getattr(listing, f.name)
+            for f in fields(Listing)
+            if f.type is not list
+        },
+        images=tuple(media_item(image.link) for image in listing.images),
+        images_floorplans=tuple(
+            media_item(image.link) for image in listing.images_floorplans
+        ),
+        listers=tuple(
+            module.FrozenLister(**lister.__dict__) for lister in listing.listers
+        ),
+        inspections=tuple(
+            module.FrozenInspection(**inspection.__dict__)
+            for inspection in listing.inspections
+        ),
+    )
+
+
+# Paths read from a raw search result listing to fill each Listing field
+LISTING_FIELD_PATHS = {
+    "id": ("id",),
+    "badge": ("badge.label",),
+    "url": ("_links.canonical.href",),
+    "suburb": ("address.suburb",),
+    "state": ("address.state",),
+    "postcode": ("address.postcode",),
+    "short_address": ("address.display.shortAddress",),
+    "full_address": ("address.display.fullAddress",),
+    "property_type": ("propertyType.id",),
+    "price": ("price.display",),
+    "price_text": ("price.display",),
+    "bedrooms": ("generalFeatures.bedrooms.value",),
+    "bathrooms": ("generalFeatures.bathrooms.value",),
+    "parking_spaces": ("generalFeatures.parkingSpaces.value",),
+    "building_size": ("propertySizes.building.displayValue",),
+    "building_size_unit": ("propertySizes.building.sizeUnit.displayValue",),
+    "land_size": ("propertySizes.land.displayValue",),
+    "land_size_unit": ("propertySizes.land.sizeUnit.displayValue",),
+    "listing_company_id": ("listingCompany.id",),
+    "listing_company_name": ("listingCompany.name",),
+    "listing_company_phone": ("listingCompany.businessPhone",),
+    "auction_date": ("auction.dateTime.value",),
+    "available_date": ("availableDate.display",),
+    "sold_date": ("dateSold.display",),
+    "description": ("description",),
+    "statement_of_information": ("media.statementOfInformation.href",),
+    "images": ("media.images.templatedUrl",),
+    "images_floorplans": ("media.floorplans.templatedUrl",),
+    "listers": (
+        "listers.id",
+        "listers.name",
+        "listers.agentId",
+        "listers.jobTitle",
+        "listers._links.canonical.href",
+        "listers.preferredPhoneNumber",
+        "listers.email",
+    ),
+    "inspections": (
+        "inspections.startTime",
+        "inspections.endTime",
+        "inspections.display.longLabel",
+        "inspections.display.shortLabel",
+    ),
+}
+
+
+def get_listing_paths(listing_fields):
+    """
+    Sorted raw listing paths needed for the given Listing fields. id is always included.
+    """
+    unknown = set(listing_fields) - set(LISTING_FIELD_PATHS)
+    if unknown:
+        raise ValueError(f"Unknown Listing fields: {', '.join(sorted(unknown))}")
+    return tuple(
+        sorted({"id"}.union(*(LISTING_FIELD_PATHS[name] for name in listing_fields)))
+    )
+
+
+# Last "$<amount>" in the text, e.g. "$500,000 - $550,000" -> "550,000".
+# Equivalent to r".*\$([0-9\,\.]+(?:k|K|m|M)*).*" without its backtracking.
+PRICE_PATTERN = re.compile(r"\$([0-9,.]+[kKmM]*)")
+IMAGE_SIZE = "1144x888-format=webp"
+
+
+def get_path(obj, *keys):
+    """Null-safe nested lookup: returns None as soon as a key is missing or null"""
+    for key in keys:
+        if obj is None:
+            return None
+        obj = obj.get(key)
+    return obj
+
+
 def parse_availability(availability):
     if not availability:
         return None
@@ -73,13 +207,10 @@ def parse_availability(availability):
 
 
 def parse_price_text(price_display_text):
-    regex = r".*\$([0-9\,\.]+(?:k|K|m|M)*).*"
-    price_groups = re.search(regex, price_display_text)
-    price_text = (
-        price_groups.groups()[0] if price_groups and price_groups.groups() else None
-    )
-    if price_text is None:
+    price_groups = PRICE_PATTERN.findall(price_display_text or "")
+    if not price_groups:
         return None
+    price_text = price_groups[-1]
 
     price = None
     if price_text[-1] == "k" or price_text[-1] == "K":
@@ -95,6 +226,12 @@ def parse_price_text(price_display_text):
     return int(price)
 
 
+def parse_land_size(land_size_text):
+    if land_size_text is None:
+        return -1.0
+    return float(land_size_text.replace(",", ""))
+
+
 def parse_phone(phone):
     if not phone:
         return None
@@ -109,127 +246,195 @@ def parse_description(description):
 
 
 def get_lister(lister):
-    lister = delete_nulls(lister)
-    lister_id = lister.get("id")
-    name = lister.get("name")
-    agent_id = lister.get("agentId")
-    job_title = lister.get("jobTitle")
-    url = lister.get("_links", {}).get("canonical", {}).get("href")
-    phone = parse_phone(lister.get("preferredPhoneNumber"))
-    email = lister.get("email")  # TODO untested, need to confirm
     return Lister(
-        id=lister_id,
-        name=name,
-        agent_id=agent_id,
-        job_title=job_title,
-        url=url,
-        phone=phone,
-        email=email,
+        id=lister.get("id"),
+        name=lister.get("name"),
+        agent_id=lister.get("agentId"),
+        job_title=lister.get("jobTitle"),
+        url=get_path(lister, "_links", "canonical", "href"),
+        phone=parse_phone(lister.get("preferredPhoneNumber")),
+        email=lister.get("email"),  # TODO untested, need to confirm
     )
 
 
 def get_image(media):
     """Creates an object representing an image from the listing. Replaces the {size} parameter with a known working varaible"""
-    size_to_insert_into_link = "1144x888-format=webp"
-    return MediaItem(
-        link=media.get("templatedUrl", {}).replace("{size}", size_to_insert_into_link)
-    )
+    link = media.get("templatedUrl")
+    return MediaItem(link=link.replace("{size}", IMAGE_SIZE) if link else None)
 
 
 def get_inspection(inspection):
-    inspection = delete_nulls(inspection)
-    start_time = inspection.get("startTime")
-    end_time = inspection.get("endTime")
-    label = inspection.get("display", []).get("longLabel")
-    label_short = inspection.get("display", []).get("shortLabel")
+    display = inspection.get("display") or {}
     return Inspection(
-        start_time=start_time, end_time=end_time, label=label, label_short=label_short
+        start_time=inspection.get("startTime"),
+        end_time=inspection.get("endTime"),
+        label=display.get("longLabel"),
+        label_short=display.get("shortLabel"),
     )
 
 
 def get_listing(listing):
-    listing = delete_nulls(listing)
-    # delete null keys for convenience
-
-    property_id = listing.get("id")
-    badge = listing.get("badge", {}).get("label")
-    url = listing.get("_links", {}).get("canonical", {}).get("href")
-    address = listing.get("address", {})
-    suburb = address.get("suburb")
-    state = address.get("state")
-    postcode = address.get("postcode")
-    short_address = address.get("display", {}).get("shortAddress")
-    full_address = address.get("display", {}).get("fullAddress")
-    property_type = listing.get("propertyType", {}).get("id")
-    listing_company = listing.get("listingCompany", {})
-    listing_company_id = listing_company.get("id")
-    listing_company_name = listing_company.get("name")
-    listing_company_phone = parse_phone(listing_company.get("businessPhone"))
-    features = listing.get("generalFeatures", {})
-    bedrooms = features.get("bedrooms", {}).get("value")
-    bathrooms = features.get("bathrooms", {}).get("value")
-    parking_spaces = features.get("parkingSpaces", {}).get("value")
-    property_sizes = listing.get("propertySizes", {})
-    building_size = property_sizes.get("building", {}).get("displayValue")
-    building_size_unit = (
-        property_sizes.get("building", {}).get("sizeUnit", {}).get("displayValue")
-    )
-    land_size = float(
-        "".join(property_sizes.get("land", {}).get("displayValue", "-1").split(","))
-    )
-    land_size_unit = (
-        property_sizes.get("land", {}).get("sizeUnit", {}).get("displayValue")
-    )
-    price_text = listing.get("price", {}).get("display", "")
-    price = parse_price_text(price_text)
-    price_text = listing.get("price", {}).get("display")
-    sold_date = listing.get("dateSold", {}).get("display")
-    auction = listing.get("auction", {}) or {}
-    auction_date = auction.get("dateTime", {}).get("value")
-    available_date_text = listing.get("availableDate", {}).get("display")
-    available_date = parse_availability(available_date_text)
-    description = parse_description(listing.get("description"))
-    images = [get_image(media) for media in listing.get("media", []).get("images", [])]
-    images_floorplans = [
-        get_image(media) for media in listing.get("media", []).get("floorplans", [])
-    ]
-    listers = [get_lister(lister) for lister in listing.get("listers", [])]
-    inspections = [
-        get_inspection(inspection) for inspection in listing.get("inspections", [])
-    ]
-    statement_of_information = (
-        listing.get("media", []).get("statementOfInformation", {}).get("href")
-    )
+    """
+    Parses a listing in a single pass over the raw response dict, without copying it.
+    """
+    get = listing.get
+    address = get("address") or {}
+    address_display = address.get("display") or {}
+    listing_company = get("listingCompany") or {}
+    features = get("generalFeatures") or {}
+    property_sizes = get("propertySizes") or {}
+    building = property_sizes.get("building") or {}
+    land = property_sizes.get("land") or {}
+    media = get("media") or {}
+    price_text = get_path(listing, "price", "display")
 
     return Listing(
-        id=property_id,
-        badge=badge,
-        url=url,
-        suburb=suburb,
-        state=state,
-        postcode=postcode,
-        short_address=short_address,
-        full_address=full_address,
-        property_type=property_type,
-        listing_company_id=listing_company_id,
-        listing_company_name=listing_company_name,
-        listing_company_phone=listing_company_phone,
-        bedrooms=bedrooms,
-        bathrooms=bathrooms,
-        parking_spaces=parking_spaces,
-        building_size=building_size,
-        building_size_unit=building_size_unit,
-        land_size=land_size,
-        land_size_unit=land_size_unit,
-        price=price,
+        id=get("id"),
+        badge=get_path(listing, "badge", "label"),
+        url=get_path(listing, "_links", "canonical", "href"),
+        suburb=address.get("suburb"),
+        state=address.get("state"),
+        postcode=address.get("postcode"),
+        short_address=address_display.get("shortAddress"),
+        full_address=address_display.get("fullAddress"),
+        property_type=get_path(listing, "propertyType", "id"),
+        listing_company_id=listing_company.get("id"),
+        listing_company_name=listing_company.get("name"),
+        listing_company_phone=parse_phone(listing_company.get("businessPhone")),
+        bedrooms=get_path(features, "bedrooms", "value"),
+        bathrooms=get_path(features, "bathrooms", "value"),
+        parking_spaces=get_path(features, "parkingSpaces", "value"),
+        building_size=building.get("displayValue"),
+        building_size_unit=get_path(building, "sizeUnit", "displayValue"),
+        land_size=parse_land_size(land.get("displayValue")),
+        land_size_unit=get_path(land, "sizeUnit", "displayValue"),
+        price=parse_price_text(price_text),
         price_text=price_text,
-        auction_date=auction_date,
-        available_date=available_date,
-        sold_date=sold_date,
-        description=description,
-        statement_of_information=statement_of_information,
-        images=images,
-        images_floorplans=images_floorplans,
-        listers=listers,
-        inspections=inspections,
+        auction_date=get_path(listing, "auction", "dateTime", "value"),
+        available_date=parse_availability(
+            get_path(listing, "availableDate", "display")
+        ),
+        sold_date=get_path(listing, "dateSold", "display"),
+        description=parse_description(get("description")),
+        statement_of_information=get_path(media, "statementOfInformation", "href"),
+        images=[get_image(image) for image in media.get("images") or ()],
+        images_floorplans=[get_image(image) for image in media.get("floorplans") or ()],
+        listers=[get_lister(lister) for lister in get("listers") or ()],
+        inspections=[
+            get_inspection(inspection) for inspection in get("inspections") or ()
+        ],
     )
+
+
+class _LazyField:
+    """
+    Computes a field from the raw listing on first access. The value is stored in
+    the instance __dict__, which takes precedence over this non-data descriptor on
+    later accesses.
+    """
+
+    def __init__(self, parse):
+        self.parse = parse
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, listing, owner=None):
+        if listing is None:
+            return self
+        value = listing.__dict__[self.name] = self.parse(listing._raw)
+        return value
+
+
+class LazyListing(Listing):
+    """
+    A Listing that keeps the raw search result and parses each field the first time
+    it is read. Compares equal to a Listing with the same field values.
+    """
+
+    id = _LazyField(lambda raw: raw.get("id"))
+    badge = _LazyField(lambda raw: get_path(raw, "badge", "label"))
+    url = _LazyField(lambda raw: get_path(raw, "_links", "canonical", "href"))
+    suburb = _LazyField(lambda raw: get_path(raw, "address", "suburb"))
+    state = _LazyField(lambda raw: get_path(raw, "address", "state"))
+    postcode = _LazyField(lambda raw: get_path(raw, "address", "postcode"))
+    short_address = _LazyField(
+        lambda raw: get_path(raw, "address", "display", "shortAddress")
+    )
+    full_address = _LazyField(
+        lambda raw: get_path(raw, "address", "display", "fullAddress")
+    )
+    property_type = _LazyField(lambda raw: get_path(raw, "propertyType", "id"))
+    price = _LazyField(lambda raw: parse_price_text(get_path(raw, "price", "display")))
+    price_text = _LazyField(lambda raw: get_path(raw, "price", "display"))
+    bedrooms = _LazyField(
+        lambda raw: get_path(raw, "generalFeatures", "bedrooms", "value")
+    )
+    bathrooms = _LazyField(
+        lambda raw: get_path(raw, "generalFeatures", "bathrooms", "value")
+    )
+    parking_spaces = _LazyField(
+        lambda raw: get_path(raw, "generalFeatures", "parkingSpaces", "value")
+    )
+    building_size = _LazyField(
+        lambda raw: get_path(raw, "propertySizes", "building", "displayValue")
+    )
+    building_size_unit = _LazyField(
+        lambda raw: get_path(
+            raw, "propertySizes", "building", "sizeUnit", "displayValue"
+        )
+    )
+    land_size = _LazyField(
+        lambda raw: parse_land_size(
+            get_path(raw, "propertySizes", "land", "displayValue")
+        )
+    )
+    land_size_unit = _LazyField(
+        lambda raw: get_path(raw, "propertySizes", "land", "sizeUnit", "displayValue")
+    )
+    listing_company_id = _LazyField(lambda raw: get_path(raw, "listingCompany", "id"))
+    listing_company_name = _LazyField(
+        lambda raw: get_path(raw, "listingCompany", "name")
+    )
+    listing_company_phone = _LazyField(
+        lambda raw: parse_phone(get_path(raw, "listingCompany", "businessPhone"))
+    )
+    auction_date = _LazyField(lambda raw: get_path(raw, "auction", "dateTime", "value"))
+    available_date = _LazyField(
+        lambda raw: parse_availability(get_path(raw, "availableDate", "display"))
+    )
+    sold_date = _LazyField(lambda raw: get_path(raw, "dateSold", "display"))
+    description = _LazyField(lambda raw: parse_description(raw.get("description")))
+    statement_of_information = _LazyField(
+        lambda raw: get_path(raw, "media", "statementOfInformation", "href")
+    )
+    images = _LazyField(
+        lambda raw: [
+            get_image(image) for image in get_path(raw, "media", "images") or ()
+        ]
+    )
+    images_floorplans = _LazyField(
+        lambda raw: [
+            get_image(image) for image in get_path(raw, "media", "floorplans") or ()
+        ]
+    )
+    listers = _LazyField(
+        lambda raw: [get_lister(lister) for lister in raw.get("listers") or ()]
+    )
+    inspections = _LazyField(
+        lambda raw: [
+            get_inspection(inspection) for inspection in raw.get("inspections") or ()
+        ]
+    )
+
+    def __init__(self, raw=None, **values):
+        # values are already parsed fields, as passed by dataclasses.replace
+        self._raw = raw or {}
+        self.__dict__.update(values)
+
+    def __eq__(self, other):
+        if not isinstance(other, Listing):
+            return NotImplemented
+        return all(
+            getattr(self, f.name) == getattr(other, f.name) for f in fields(Listing)
+        )
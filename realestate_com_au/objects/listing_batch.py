@@ -0,0 +1,176 @@
+from array import array
+from dataclasses import fields
+
+from realestate_com_au.objects.listing import (
+    Inspection,
+    Lister,
+    Listing,
+    MediaItem,
+)
+from realestate_com_au.utils import import_optional
+
+NUMERIC_FIELDS = ("price", "bedrooms", "bathrooms", "parking_spaces", "land_size")
+MEDIA_FIELDS = ("images", "images_floorplans")
+NESTED_FIELDS = ("listers", "inspections")
+STRING_FIELDS = tuple(
+    f.name
+    for f in fields(Listing)
+    if f.name not in NUMERIC_FIELDS + MEDIA_FIELDS + NESTED_FIELDS
+)
+
+
+def get_arrow_schema():
+    """
+    Arrow schema of ListingBatch.to_arrow, in Listing field order.
+    """
+    pa = import_optional("pyarrow", "get_arrow_schema", "parquet")
+
+    def struct_of(cls):
+        return pa.struct([(f.name, pa.string()) for f in fields(cls)])
+
+    nested_types = {
+        "images": pa.large_list(pa.string()),
+        "images_floorplans": pa.large_list(pa.string()),
+        "listers": pa.large_list(struct_of(Lister)),
+        "inspections": pa.large_list(struct_of(Inspection)),
+    }
+    return pa.schema(
+        [
+            (
+                f.name,
+                (
+                    pa.float64()
+                    if f.name in NUMERIC_FIELDS
+                    else nested_types.get(f.name, pa.string())
+                ),
+            )
+            for f in fields(Listing)
+        ]
+    )
+
+
+class ListingBatch:
+    """
+    Columnar container of listings.
+
+    Numeric fields are float64 arrays (NaN for missing values) and other scalar
+    fields are lists. Images are flat lists of links, and listers/inspections flat
+    lists of objects, each with an offsets array: row i owns
+    values[offsets[i]:offsets[i + 1]].
+
+    Numeric columns and offsets share memory with numpy/pandas/Arrow on conversion.
+    """
+
+    def __init__(self, listings=()):
+        self.columns = {name: array("d") for name in NUMERIC_FIELDS}
+        self.columns.update({name: [] for name in STRING_FIELDS})
+        self.values = {name: [] for name in MEDIA_FIELDS + NESTED_FIELDS}
+        self.offsets = {name: array("q", [0]) for name in MEDIA_FIELDS + NESTED_FIELDS}
+        self.extend(listings)
+
+    def __len__(self):
+        return len(self.columns["id"])
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        row = {name: self.columns[name][i] for name in STRING_FIELDS}
+        for name in NUMERIC_FIELDS:
+            value = self.columns[name][i]
+            row[name] = None if value != value else value
+        for name in ("price", "bedrooms", "bathrooms", "parking_spaces"):
+            if row[name] is not None:
+                row[name] = int(row[name])
+        for name in MEDIA_FIELDS:
+            row[name] = [MediaItem(link=link) for link in self.get_values(name, i)]
+        for name in NESTED_FIELDS:
+            row[name] = list(self.get_values(name, i))
+        return Listing(**row)
+
+    def get_values(self, name, i):
+        """Images, floorplans, listers or inspections of row i."""
+        offsets = self.offsets[name]
+        return self.values[name][offsets[i] : offsets[i + 1]]
+
+    def append(self, listing):
+        for name in NUMERIC_FIELDS:
+            value = getattr(listing, name)
+            self.columns[name].append(float("nan") if value is None else value)
+        for name in STRING_FIELDS:
+            self.columns[name].append(getattr(listing, name))
+        for name in MEDIA_FIELDS:
+            self.values[name].extend(item.link for item in getattr(listing, name))
+            self.offsets[name].append(len(self.values[name]))
+        for name in NESTED_FIELDS:
+            self.values[name].extend(getattr(listing, name))
+            self.offsets[name].append(len(self.values[name]))
+
+    def extend(self, listings):
+        for listing in listings:
+            self.append(listing)
+
+    def to_numpy(self, name):
+        """Zero-copy numpy view of a numeric column or an offsets array."""
+        np = import_optional("numpy", "ListingBatch.to_numpy", "pandas")
+
+        if name in NUMERIC_FIELDS:
+            return np.frombuffer(self.columns[name], dtype=np.float64)
+        return np.frombuffer(self.offsets[name], dtype=np.int64)
+
+    def to_pandas(self, nested=False):
+        """
+        DataFrame of the scalar columns. Numeric columns are not copied. With
+        nested=True, images/listers/inspections are added as per-row lists.
+        """
+        pd = import_optional("pandas", "ListingBatch.to_pandas", "pandas")
+
+        data = {}
+        for f in fields(Listing):
+            if f.name in NUMERIC_FIELDS:
+                data[f.name] = self.to_numpy(f.name)
+            elif f.name in STRING_FIELDS:
+                data[f.name] = self.columns[f.name]
+            elif nested:
+                data[f.name] = [self.get_values(f.name, i) for i in range(len(self))]
+        return pd.DataFrame(data, copy=False)
+
+    def to_arrow(self):
+        """
+        pyarrow Table with images as list<string> and listers/inspections as
+        list<struct> columns. Numeric buffers and offsets are not copied.
+        """
+        pa = import_optional("pyarrow", "ListingBatch.to_arrow", "parquet")
+
+        nested_classes = {"listers": Lister, "inspections": Inspection}
+        arrays = {}
+        for f in fields(Listing):
+            name = f.name
+            if name in NUMERIC_FIELDS:
+                arrays[name] = pa.array(self.to_numpy(name), from_pandas=True)
+            elif name in STRING_FIELDS:
+                arrays[name] = pa.array(self.columns[name], pa.string())
+            elif name in MEDIA_FIELDS:
+                arrays[name] = pa.LargeListArray.from_arrays(
+                    pa.array(self.to_numpy(name)),
+                    pa.array(self.values[name], pa.string()),
+                )
+            else:
+                nested_fields = fields(nested_classes[name])
+                struct_values = pa.StructArray.from_arrays(
+                    [
+                        pa.array(
+                            [getattr(v, nf.name) for v in self.values[name]],
+                            pa.string(),
+                        )
+                        for nf in nested_fields
+                    ],
+                    names=[nf.name for nf in nested_fields],
+                )
+                arrays[name] = pa.LargeListArray.from_arrays(
+                    pa.array(self.to_numpy(name)), struct_values
+                )
+        return pa.table(arrays, schema=get_arrow_schema())
@@ -0,0 +1,41 @@
+"""
+Decoding and parsing of search pages in worker processes
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+from time import perf_counter
+
+from realestate_com_au.json_backends import get_json_backend
+from realestate_com_au.objects.listing_batch import ListingBatch
+
+
+@dataclass
+class ParsedPage:
+    items: list  # Listings, or a ListingBatch
+    decode_seconds: float
+    parse_seconds: float
+
+
+@lru_cache(maxsize=None)
+def _get_json_backend(name):
+    return get_json_backend(name)
+
+
+def parse_body(query, body, json_backend=None, batch=False):
+    """
+    Decodes a search page body and parses its listings with query.parse_items.
+    Returns a ParsedPage, or None if the body is a persisted query miss. Runs in a
+    worker process, so everything it takes and returns must pickle.
+    """
+    start = perf_counter()
+    data = _get_json_backend(json_backend).loads(body)
+    decode_seconds = perf_counter() - start
+    if query.persisted_query and query.is_persisted_query_miss(data):
+        return None
+
+    start = perf_counter()
+    items = query.parse_items(data)
+    if batch:
+        items = ListingBatch(items)
+    return ParsedPage(items, decode_seconds, perf_counter() - start)
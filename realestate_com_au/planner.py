@@ -0,0 +1,170 @@
+"""
+Splits searches that exceed the server's result cap into sub-searches that fit under it
+"""
+
+import logging
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import replace
+
+from realestate_com_au.query import dedupe_listings
+
+logger = logging.getLogger(__name__)
+
+# Upper price bound used to split searches with no max_price
+PRICE_CEILINGS = {"buy": 20000000, "sold": 20000000, "rent": 20000}
+# Price ranges narrower than this are not split further
+MIN_PRICE_SPANS = {"buy": 10000, "sold": 10000, "rent": 10}
+# Bedroom counts from this up are not split further
+MAX_SPLIT_BEDROOMS = 6
+
+
+def has_price_filter(query):
+    """
+    True if `query` sends a price range, which makes the server drop listings without
+    a displayed price.
+    """
+    return query.max_price is not None and (query.max_price > -1 or query.min_price > 0)
+
+
+def split_query(query, split_price=True):
+    """
+    Returns sub-queries that together cover `query`, splitting its price range (unless
+    `split_price` is false), then its bedroom range, then its locations. Returns None
+    when it cannot be split.
+    """
+    min_price = max(query.min_price, 0)
+    max_price = query.max_price
+    if split_price:
+        if max_price is None or max_price < 0:
+            ceiling = PRICE_CEILINGS.get(query.channel, PRICE_CEILINGS["buy"])
+            if min_price < ceiling:
+                return [
+                    replace(query, min_price=min_price, max_price=ceiling),
+                    replace(query, min_price=ceiling + 1, max_price=-1),
+                ]
+        elif max_price - min_price > MIN_PRICE_SPANS.get(query.channel, 1):
+            middle = (min_price + max_price) // 2
+            return [
+                replace(query, min_price=min_price, max_price=middle),
+                replace(query, min_price=middle + 1, max_price=max_price),
+            ]
+
+    min_bedrooms = max(query.min_bedrooms, 0)
+    max_bedrooms = query.max_bedrooms
+    if max_bedrooms is None or max_bedrooms < 0:
+        if min_bedrooms < MAX_SPLIT_BEDROOMS:
+            return [
+                replace(query, min_bedrooms=min_bedrooms, max_bedrooms=min_bedrooms),
+                replace(query, min_bedrooms=min_bedrooms + 1, max_bedrooms=-1),
+            ]
+    elif max_bedrooms > min_bedrooms:
+        middle = (min_bedrooms + max_bedrooms) // 2
+        return [
+            replace(query, min_bedrooms=min_bedrooms, max_bedrooms=middle),
+            replace(query, min_bedrooms=middle + 1, max_bedrooms=max_bedrooms),
+        ]
+
+    if len(query.locations) > 1:
+        middle = len(query.locations) // 2
+        return [
+            replace(query, locations=query.locations[:middle]),
+            replace(query, locations=query.locations[middle:]),
+        ]
+
+    return None
+
+
+def is_capped(query, data, max_results=None):
+    """
+    True if the first page's response shows more results than can be paged through.
+    """
+    results = query.get_results(data)
+    total = results.get("totalResultsCount") or 0
+    if max_results is not None and total > max_results:
+        return True
+    pagination = results.get("pagination") or {}
+    max_page = pagination.get("maxPageNumberAvailable")
+    page_size = pagination.get("pageSize") or query.get_page_size()
+    return bool(max_page) and total > max_page * page_size
+
+
+def run_plan(
+    query, fetch_page, workers=4, max_results=None, parse_items=None, incomplete=None
+):
+    """
+    Fetches every listing matching `query`, recursively splitting it with split_query
+    while it is capped. fetch_page(query, page) returns a decoded response and is called
+    from `workers` threads. Pages are parsed with parse_items(query, data), by default
+    query.parse_items. Listings are merged in plan order and de-duplicated by id.
+
+    A capped sub-query that cannot be split is paged up to the cap, logged as a
+    warning and, when `incomplete` is a list, appended to it as a
+    (sub-query, total results count) pair.
+
+    The server drops listings without a displayed price once a price range is applied,
+    so when a query without one is split by price, it is also fetched again split only
+    by bedrooms and locations, after its priced sub-queries, to pick those listings up.
+    That pass re-fetches the priced listings too and is skipped when the query sets
+    exclude_no_sale_price.
+    """
+    parse_items = parse_items or (lambda query, data: query.parse_items(data))
+    pages = {}  # (plan path, page) -> listings
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+
+        def probe(path, query, split_price=True):
+            future = executor.submit(fetch_page, query, 1)
+            return future, ("probe", path, query, split_price)
+
+        def fetch(path, query, page):
+            return executor.submit(fetch_page, query, page), ("page", path, query, page)
+
+        pending = dict([probe((), query)])
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                task = pending.pop(future)
+                data = future.result()
+                if task[0] == "page":
+                    _, path, query, page = task
+                    pages[(path, page)] = parse_items(query, data)
+                    continue
+
+                _, path, query, split_price = task
+                if is_capped(query, data, max_results):
+                    sub_queries = split_query(query, split_price)
+                    if sub_queries:
+                        pending.update(
+                            probe(path + (i,), sub_query, split_price)
+                            for i, sub_query in enumerate(sub_queries)
+                        )
+                        if (
+                            not query.exclude_no_sale_price
+                            and not has_price_filter(query)
+                            and has_price_filter(sub_queries[0])
+                        ):
+                            pending.update(
+                                [probe(path + (len(sub_queries),), query, False)]
+                            )
+                        continue
+
+                    total = query.get_results(data).get("totalResultsCount")
+                    logger.warning(
+                        "Search is capped and cannot be split further, so not all "
+                        "of its %s results will be fetched: %s",
+                        total,
+                        query,
+                    )
+                    if incomplete is not None:
+                        incomplete.append((query, total))
+
+                items = parse_items(query, data)
+                pages[(path, 1)] = items
+                if query.is_done(len(items), data):
+                    continue
+                pending.update(
+                    fetch(path, query, page)
+                    for page in query.get_page_range(len(items), data, 2)
+                )
+
+    return dedupe_listings(listing for key in sorted(pages) for listing in pages[key])
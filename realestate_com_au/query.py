@@ -0,0 +1,332 @@
+"""
+Builds search payloads and parses search responses. Shared by the sync and async clients.
+"""
+
+import json
+import math
+from dataclasses import dataclass, field
+
+from realestate_com_au.graphql import get_document
+from realestate_com_au.graphql.projection import build_query, get_query_hash
+from realestate_com_au.keywords import get_keyword_matcher
+from realestate_com_au.objects.listing import (
+    LazyListing,
+    get_listing,
+    get_listing_paths,
+)
+
+MAX_SEARCH_PAGE_SIZE = 100  # TODO untested
+DEFAULT_SEARCH_PAGE_SIZE = 25
+
+
+@dataclass
+class SearchQuery:
+    limit: int = -1
+    start_page: int = 1
+    sold_limit: int = -1
+    channel: str = "buy"
+    locations: list = field(default_factory=list)
+    surrounding_suburbs: bool = True
+    exclude_no_sale_price: bool = False
+    furnished: bool = False
+    pets_allowed: bool = False
+    ex_under_contract: bool = False
+    min_price: int = 0
+    max_price: int = -1
+    min_bedrooms: int = 0
+    max_bedrooms: int = -1
+    property_types: list = field(
+        default_factory=list
+    )  # "house", "unit apartment", "townhouse", "villa", "land", "acreage", "retire", "unitblock",
+    min_bathrooms: int = 0
+    min_carspaces: int = 0
+    min_land_size: int = 0
+    construction_status: str = None  # NEW, ESTABLISHED
+    keywords: list = field(default_factory=list)
+    exclude_keywords: list = field(default_factory=list)  # literal text, not regexes
+    exclude_ignore_case: bool = False
+    exclude_whole_words: bool = False  # only exclude on whole-word matches
+    sort_type: str = (
+        "relevance"  # // "relevance", "price-desc", "price-asc", "new-desc", "new-asc", "next-inspection-time", "next-auction-time"
+    )
+    page_size: int = None  # overrides the page size derived from limit
+    fields: tuple = None  # Listing fields to request. None requests the full document
+    persisted_query: bool = False  # send the document's hash instead of the document
+    lazy: bool = (
+        False  # parse listings as LazyListings, whose fields parse on first read
+    )
+
+    def get_page_size(self):
+        if self.page_size:
+            return self.page_size
+        return (
+            min(self.limit, MAX_SEARCH_PAGE_SIZE)
+            if self.limit
+            else DEFAULT_SEARCH_PAGE_SIZE
+        )
+
+    def get_query_variables(self, page=None):
+        query_variables = {
+            "channel": self.channel,
+            "page": self.start_page if page is None else page,
+            "pageSize": self.get_page_size(),
+            "localities": [{"searchLocation": location} for location in self.locations],
+            "filters": {
+                "surroundingSuburbs": self.surrounding_suburbs,
+                "excludeNoSalePrice": self.exclude_no_sale_price,
+                "ex-under-contract": self.ex_under_contract,
+                "furnished": self.furnished,
+                "petsAllowed": self.pets_allowed,
+            },
+        }
+        max_price = self.max_price
+        min_price = self.min_price
+        if (max_price is not None and max_price > -1) or (
+            max_price is not None and min_price > 0
+        ):
+            price_filter = {}
+            if max_price > -1:
+                price_filter["maximum"] = str(max_price)
+            if min_price > 0:
+                price_filter["minimum"] = str(min_price)
+            query_variables["filters"]["priceRange"] = price_filter
+        max_bedrooms = self.max_bedrooms
+        min_bedrooms = self.min_bedrooms
+        if (max_bedrooms is not None and max_bedrooms > -1) or (
+            max_bedrooms is not None and min_bedrooms > 0
+        ):
+            beds_filter = {}
+            if max_bedrooms > -1:
+                beds_filter["maximum"] = str(max_bedrooms)
+            if min_bedrooms > 0:
+                beds_filter["minimum"] = str(min_bedrooms)
+            query_variables["filters"]["bedroomsRange"] = beds_filter
+        if self.property_types:
+            query_variables["filters"]["propertyTypes"] = self.property_types
+        if self.min_bathrooms is not None and self.min_bathrooms > 0:
+            query_variables["filters"]["minimumBathroom"] = str(self.min_bathrooms)
+        if self.min_carspaces is not None and self.min_carspaces > 0:
+            query_variables["filters"]["minimumCars"] = str(self.min_carspaces)
+        if self.min_land_size is not None and self.min_land_size > 0:
+            query_variables["filters"]["landSize"] = {
+                "minimum": str(self.min_land_size)
+            }
+        if self.construction_status:
+            query_variables["filters"]["constructionStatus"] = self.construction_status
+        if self.keywords:
+            query_variables["filters"]["keywords"] = {"terms": self.keywords}
+        if self.sort_type:
+            query_variables["sortType"] = self.sort_type
+        return query_variables
+
+    def get_requested_fields(self):
+        """
+        Listing fields to request, plus description when exclude_keywords needs it.
+        None requests the full document.
+        """
+        if not self.fields:
+            return None
+        if self.exclude_keywords and "description" not in self.fields:
+            return (*self.fields, "description")
+        return self.fields
+
+    def get_query(self):
+        fields = self.get_requested_fields()
+        if fields:
+            return build_query(self.channel, get_listing_paths(fields))
+
+        return get_document(self.channel if self.channel in ("buy", "sold") else "rent")
+
+    def get_payload(self, page, send_document=False):
+        """
+        With persisted_query, the payload carries the document's sha256 and only
+        includes the document itself when send_document is set, which registers it
+        after a persisted query miss.
+        """
+        query = self.get_query()
+        payload = {
+            "operationName": "searchByQuery",
+            "variables": {
+                "query": json.dumps(self.get_query_variables(page)),
+                "testListings": False,
+                "nullifyOptionals": False,
+            },
+            "query": query,
+        }
+
+        if self.channel == "rent":
+            payload["variables"]["recentHides"] = []
+
+        if self.persisted_query:
+            payload["extensions"] = {
+                "persistedQuery": {"version": 1, "sha256Hash": get_query_hash(query)}
+            }
+            if not send_document:
+                del payload["query"]
+
+        return payload
+
+    def get_cache_variables(self, page):
+        """
+        Query variables identifying a page's response, including any field projection.
+        """
+        query_variables = self.get_query_variables(page)
+        fields = self.get_requested_fields()
+        if fields:
+            query_variables["fields"] = sorted(fields)
+        return query_variables
+
+    @staticmethod
+    def is_persisted_query_miss(data):
+        return any(
+            error.get("message") == "PersistedQueryNotFound"
+            or (error.get("extensions") or {}).get("code")
+            == "PERSISTED_QUERY_NOT_FOUND"
+            for error in data.get("errors") or []
+        )
+
+    def get_results(self, data):
+        return data.get("data", {}).get(f"{self.channel}Search", {}).get("results", {})
+
+    def get_exclude_matcher(self):
+        return get_keyword_matcher(
+            tuple(self.exclude_keywords),
+            self.exclude_ignore_case,
+            self.exclude_whole_words,
+        )
+
+    def parse_items(self, data, listings_by_id=None):
+        """
+        Parses a page into Listings. Listings whose raw description contains any of
+        exclude_keywords are dropped before they are parsed. Listings whose id is
+        already in listings_by_id are reused instead of parsed, and newly parsed ones
+        are added to it.
+        """
+        results = self.get_results(data)
+
+        exact_listings = (results.get("exact", {}) or {}).get("items", [])
+        surrounding_listings = (results.get("surrounding", {}) or {}).get("items", [])
+        raw_listings = [
+            item.get("listing", {}) or {}
+            for item in exact_listings + surrounding_listings
+        ]
+
+        matcher = self.get_exclude_matcher()
+        if matcher:
+            raw_listings = [
+                raw_listing
+                for raw_listing in raw_listings
+                if not matcher.search(raw_listing.get("description"))
+            ]
+
+        parse_listing = LazyListing if self.lazy else get_listing
+        if listings_by_id is None:
+            return [parse_listing(raw_listing) for raw_listing in raw_listings]
+
+        listings = []
+        for raw_listing in raw_listings:
+            listing = listings_by_id.get(raw_listing.get("id"))
+            if listing is None:
+                listing = listings_by_id.setdefault(
+                    raw_listing.get("id"), parse_listing(raw_listing)
+                )
+            listings.append(listing)
+        return listings
+
+    @property
+    def target_count(self):
+        """
+        Number of listings after which paging stops, or -1 to page until the results run out.
+        """
+        targets = [self.limit] if self.limit > -1 else []
+        if self.channel == "sold" and self.sold_limit > -1:
+            targets.append(self.sold_limit)
+        return min(targets) if targets else -1
+
+    def is_done(self, items_count, data):
+        if not items_count:
+            return True
+
+        if self.limit > -1 and items_count >= self.limit:
+            return True
+
+        # Sold Listings Limit (Sold listings accumulate indefinetely. Enables data from X most recent sold listings only)
+        if (
+            self.channel == "sold"
+            and self.sold_limit > -1
+            and items_count >= self.sold_limit
+        ):
+            return True
+
+        pagination = self.get_results(data).get("pagination")
+        if not pagination.get("moreResultsAvailable"):
+            return True
+
+        return False
+
+    def get_page_range(self, items_count, data, page):
+        """
+        Pages from `page` onwards worth fetching concurrently, given the first page's
+        response and the number of listings collected so far.
+        """
+        results = self.get_results(data)
+        pagination = results.get("pagination", {})
+        page_size = pagination.get("pageSize") or items_count or 1
+        max_page = pagination.get("maxPageNumberAvailable") or math.ceil(
+            results.get("totalResultsCount", 0) / page_size
+        )
+
+        last_page = max_page
+        if self.target_count > -1:
+            remaining = self.target_count - items_count
+            if remaining <= 0:
+                return range(0)
+            last_page = min(max_page, page + math.ceil(remaining / page_size) - 1)
+        return range(page, last_page + 1)
+
+
+@dataclass
+class SearchManyResult:
+    results: list  # Listings per search spec, in spec order
+    listings: list  # All listings, de-duplicated by id
+
+
+# search arguments that control how pages are fetched rather than what is searched
+FETCH_OPTIONS = ("workers", "requests_per_second", "parse_processes")
+
+
+def get_search_query(method, **kwargs):
+    """
+    SearchQuery from search's filter arguments, for methods that take them. Raises a
+    TypeError naming any of search's fetch options, which `method` does not take.
+    """
+    unsupported = [name for name in FETCH_OPTIONS if name in kwargs]
+    if unsupported:
+        raise TypeError(f"{method}() does not take {', '.join(unsupported)}")
+    if kwargs.get("fields"):
+        kwargs["fields"] = tuple(kwargs["fields"])
+    return SearchQuery(**kwargs)
+
+
+def dedupe_listings(listings):
+    seen_ids = set()
+    unique_listings = []
+    for listing in listings:
+        if listing.id in seen_ids:
+            continue
+        seen_ids.add(listing.id)
+        unique_listings.append(listing)
+    return unique_listings
+
+
+def get_contact_agent_payload(
+    from_address, from_name, message, subject="", from_phone=""
+):
+    return {
+        "lookingTo": subject,
+        "name": from_name,
+        "fromAddress": from_address,
+        "fromPhone": from_phone,
+        "message": message,
+        "likeTo": [],
+    }
@@ -4,29 +4,38 @@ Provides realestate.com.au api-related code
 
 import random
 import logging
-from time import sleep
-from urllib.parse import urlencode
-import json
-import re
-from fajita import Fajita
+import threading
+from time import perf_counter
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+from contextlib import ExitStack
+from dataclasses import replace
+from itertools import chain
 
 import realestate_com_au.settings as settings
-from realestate_com_au.graphql import searchBuy, searchRent, searchSold
-from realestate_com_au.objects.listing import get_listing
+from realestate_com_au.query import (
+    MAX_SEARCH_PAGE_SIZE,
+    DEFAULT_SEARCH_PAGE_SIZE,
+    SearchManyResult,
+    SearchQuery,
+    dedupe_listings,
+    get_contact_agent_payload,
+    get_search_query,
+)
+from realestate_com_au.json_backends import get_json_backend
+from realestate_com_au.metrics import NO_METRICS, FetchStats, ParseStats, parse_page
+from realestate_com_au.objects.listing_batch import ListingBatch
+from realestate_com_au.utils import ClientLogger, RateLimiter, default_evade
 
 logger = logging.getLogger(__name__)
 
-common_user_agents = [
-    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/104.0.0.0 Safari/537.36",
-    "Mozilla/4.0 (compatible; MSIE 6.0; Windows NT 5.1; FSL 7.0.6.01001)",
-    "Mozilla/5.0 (iPhone; CPU iPhone OS 10_3_1 like Mac OS X) AppleWebKit/603.1.30 (KHTML, like Gecko) Version/10.0 Mobile/14E304 Safari/602.1",
-    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/51.0.2704.79 Safari/537.36 Edge/14.14393",
-]
+common_user_agents = settings.USER_AGENTS
 
 
-class RealestateComAu(Fajita):
+class RealestateComAu:
     """
     Class for accessing realestate.com.au API.
+    The requests session is only created, and requests imported, on first use.
     """
 
     API_BASE_URL = "https://lexa.realestate.com.au/graphql"
@@ -38,24 +47,55 @@ class RealestateComAu(Fajita):
         "sec-fetch-site": "same-site",
         "user-agent": random.choice(common_user_agents),
     }
-    _MAX_SEARCH_PAGE_SIZE = 100  # TODO untested
-    _DEFAULT_SEARCH_PAGE_SIZE = 25
+    _MAX_SEARCH_PAGE_SIZE = MAX_SEARCH_PAGE_SIZE
+    _DEFAULT_SEARCH_PAGE_SIZE = DEFAULT_SEARCH_PAGE_SIZE
 
     def __init__(
         self,
         proxies={},
         debug=False,
+        cache=None,  # realestate_com_au.cache.ResponseCache
+        scheduler=None,  # realestate_com_au.scheduler.RequestScheduler
+        metrics=NO_METRICS,  # realestate_com_au.metrics.Metrics
+        json_backend=None,  # "json", "orjson" or "msgspec"; default: fastest installed
+        base_url=None,  # search endpoint, e.g. a local stand-in server
     ):
-        Fajita.__init__(
-            self,
-            base_url=self.API_BASE_URL,
-            headers=self.REQUEST_HEADERS,
-            proxies=proxies,
-            debug=debug,
-            cookie_directory=settings.COOKIE_PATH,
-        )
-        logging.basicConfig(level=logging.DEBUG if debug else logging.INFO)
-        self.logger = logger
+        self._base_url = base_url or self.API_BASE_URL
+        self._proxies = proxies
+        self._session = None
+        self._session_lock = threading.Lock()
+        self._fresh = True  # False once a request has been sent
+        self.logger = ClientLogger(logger, self, debug)
+        self.cache = cache
+        self.scheduler = scheduler
+        self.metrics = metrics
+        self.json_backend = get_json_backend(json_backend)
+
+    @property
+    def session(self):
+        with self._session_lock:
+            if self._session is None:
+                import requests
+
+                self._session = requests.Session()
+                self._session.headers.update(self.REQUEST_HEADERS)
+                self._session.proxies.update(self._proxies)
+        return self._session
+
+    def _post(self, uri, base_url=None, evade=default_evade, **kwargs):
+        """
+        POST request, through the scheduler when one is set. Otherwise every request
+        after the first is preceded by evade(). The scheduler paces and retries
+        requests itself, so `evade` is not used then.
+        """
+        url = f"{base_url or self._base_url}{uri}"
+        if self.scheduler is not None:
+            return self.scheduler.request(self.session.post, url, **kwargs)
+
+        if not self._fresh:
+            evade()
+        self._fresh = False
+        return self.session.post(url, **kwargs)
 
     def search(
         self,
@@ -79,156 +119,475 @@ class RealestateComAu(Fajita):
         min_land_size=0,
         construction_status=None,  # NEW, ESTABLISHED
         keywords=[],
-        exclude_keywords=[],
+        exclude_keywords=[],  # drop listings whose description contains any of these
+        exclude_ignore_case=False,
+        exclude_whole_words=False,  # only drop on whole-word matches
         sort_type="relevance",  # // "relevance", "price-desc", "price-asc", "new-desc", "new-asc", "next-inspection-time", "next-auction-time"
+        workers=1,  # > 1 fetches pages concurrently once page 1 reveals the page count
+        requests_per_second=None,  # rate limit for concurrent page fetching
+        fields=None,  # Listing fields to request, e.g. ["price", "suburb"]. Other fields are None
+        persisted_query=False,  # send a persisted query hash instead of the full document
+        parse_processes=None,  # decode and parse pages after the first in this many processes
+        lazy=False,  # return LazyListings, which parse each field on first access
     ):
-        def get_query_variables(page=start_page):
-            query_variables = {
-                "channel": channel,
-                "page": page,
-                "pageSize": (
-                    min(limit, self._MAX_SEARCH_PAGE_SIZE)
-                    if limit
-                    else self._DEFAULT_SEARCH_PAGE_SIZE
-                ),
-                "localities": [{"searchLocation": location} for location in locations],
-                "filters": {
-                    "surroundingSuburbs": surrounding_suburbs,
-                    "excludeNoSalePrice": exclude_no_sale_price,
-                    "ex-under-contract": ex_under_contract,
-                    "furnished": furnished,
-                    "petsAllowed": pets_allowed,
-                },
-            }
-            if (max_price is not None and max_price > -1) or (
-                max_price is not None and min_price > 0
-            ):
-                price_filter = {}
-                if max_price > -1:
-                    price_filter["maximum"] = str(max_price)
-                if min_price > 0:
-                    price_filter["minimum"] = str(min_price)
-                query_variables["filters"]["priceRange"] = price_filter
-            if (max_bedrooms is not None and max_bedrooms > -1) or (
-                max_bedrooms is not None and min_bedrooms > 0
-            ):
-                beds_filter = {}
-                if max_bedrooms > -1:
-                    beds_filter["maximum"] = str(max_bedrooms)
-                if min_bedrooms > 0:
-                    beds_filter["minimum"] = str(min_bedrooms)
-                query_variables["filters"]["bedroomsRange"] = beds_filter
-            if property_types:
-                query_variables["filters"]["propertyTypes"] = property_types
-            if min_bathrooms is not None and min_bathrooms > 0:
-                query_variables["filters"]["minimumBathroom"] = str(min_bathrooms)
-            if min_carspaces is not None and min_carspaces > 0:
-                query_variables["filters"]["minimumCars"] = str(min_carspaces)
-            if min_land_size is not None and min_land_size > 0:
-                query_variables["filters"]["landSize"] = {"minimum": str(min_land_size)}
-            if construction_status:
-                query_variables["filters"]["constructionStatus"] = construction_status
-            if keywords:
-                query_variables["filters"]["keywords"] = {"terms": keywords}
-            if sort_type:
-                query_variables["sortType"] = sort_type
-            return query_variables
-
-        def get_query():
-            if channel == "buy":
-                return searchBuy.QUERY
-
-            if channel == "sold":
-                return searchSold.QUERY
-
-            return searchRent.QUERY
-
-        def get_payload(query_variables):
-            payload = {
-                "operationName": "searchByQuery",
-                "variables": {
-                    "query": json.dumps(query_variables),
-                    "testListings": False,
-                    "nullifyOptionals": False,
-                },
-                "query": get_query(),
-            }
-
-            if channel == "rent":
-                payload["variables"]["recentHides"] = []
-
-            return payload
-
-        def parse_items(res):
-            data = res.json()
-            results = (
-                data.get("data", {}).get(f"{channel}Search", {}).get("results", {})
-            )
+        query = SearchQuery(
+            limit=limit,
+            start_page=start_page,
+            sold_limit=sold_limit,
+            channel=channel,
+            locations=locations,
+            surrounding_suburbs=surrounding_suburbs,
+            exclude_no_sale_price=exclude_no_sale_price,
+            furnished=furnished,
+            pets_allowed=pets_allowed,
+            ex_under_contract=ex_under_contract,
+            min_price=min_price,
+            max_price=max_price,
+            min_bedrooms=min_bedrooms,
+            max_bedrooms=max_bedrooms,
+            property_types=property_types,
+            min_bathrooms=min_bathrooms,
+            min_carspaces=min_carspaces,
+            min_land_size=min_land_size,
+            construction_status=construction_status,
+            keywords=keywords,
+            exclude_keywords=exclude_keywords,
+            exclude_ignore_case=exclude_ignore_case,
+            exclude_whole_words=exclude_whole_words,
+            sort_type=sort_type,
+            fields=tuple(fields) if fields else None,
+            persisted_query=persisted_query,
+            lazy=lazy,
+        )
 
-            exact_listings = (results.get("exact", {}) or {}).get("items", [])
-            surrounding_listings = (results.get("surrounding", {}) or {}).get(
-                "items", []
+        if workers > 1 or parse_processes:
+            return self._scroll_concurrent(
+                "",
+                query,
+                workers=workers,
+                requests_per_second=requests_per_second,
+                parse_processes=parse_processes,
             )
 
-            listings = [
-                get_listing(listing.get("listing", {}) or {})
-                for listing in exact_listings + surrounding_listings
-            ]
+        return [listing for page in self._iter_pages("", query) for listing in page]
+
+    def iter_search(self, pages=False, **kwargs):
+        """
+        Accepts search's filter arguments (not workers, requests_per_second or
+        parse_processes), but yields each Listing (or each page's list of Listings
+        when pages=True) as soon as its page is parsed. Pages are fetched lazily, so
+        stopping iteration stops further requests.
+        """
+        query = get_search_query("iter_search", **kwargs)
+        for page in self._iter_pages("", query):
+            if pages:
+                yield page
+            else:
+                yield from page
+
+    def search_batches(
+        self, workers=4, parse_processes=None, requests_per_second=None, **kwargs
+    ):
+        """
+        Accepts the same arguments as search, but yields each page's listings as a
+        ListingBatch, in page order. Pages after the first are fetched on `workers`
+        threads and, with parse_processes, decoded and parsed in that many processes.
+        Batches are cheap to send between processes, so this scales parsing across
+        cores further than search(parse_processes=...). Listings repeated across pages
+        are not removed.
+        """
+        return self._iter_pages_concurrent(
+            "",
+            get_search_query("search_batches", **kwargs),
+            workers,
+            requests_per_second=requests_per_second,
+            parse_processes=parse_processes,
+            batches=True,
+        )
 
-            # filter listings that contain exclude_keywords
-            if exclude_keywords:
-                pattern = re.compile("|".join(exclude_keywords))
-                listings = [
-                    listing
-                    for listing in listings
-                    if not re.search(pattern, str(listing.description))
-                ]
+    def search_all(
+        self,
+        workers=4,
+        requests_per_second=None,
+        max_results=None,
+        incomplete=None,
+        **kwargs,
+    ):
+        """
+        Accepts the same arguments as search except parse_processes (limit and
+        sold_limit are ignored), but returns every matching listing even when the
+        server caps how deep results can be paged. Capped searches are recursively
+        split by price, bedrooms and then locations (see planner.split_query), and the
+        sub-searches are fetched on `workers` threads and merged, de-duplicated by
+        listing id. Listings without a displayed price, which price-filtered
+        sub-searches miss, are picked up by a final pass split only by bedrooms and
+        locations (see planner.run_plan). Set max_results to split searches larger
+        than a known cap. Sub-searches still capped once they cannot be split are
+        logged and, when `incomplete` is a list, appended to it as (SearchQuery, total
+        results count) pairs.
+        """
+        query = replace(
+            get_search_query("search_all", **kwargs),
+            limit=-1,
+            sold_limit=-1,
+            page_size=MAX_SEARCH_PAGE_SIZE,
+        )
+        from realestate_com_au.planner import run_plan
 
-            return listings
+        rate_limiter = RateLimiter(requests_per_second)
 
-        def get_current_page(**kwargs):
-            current_query_variables = json.loads(kwargs["json"]["variables"]["query"])
-            return current_query_variables["page"]
+        def fetch_page(query, page):
+            return self._fetch_page(
+                "", query, page, rate_limiter=rate_limiter, evade=lambda: None
+            )
 
-        def next_page(**kwargs):
-            current_page = get_current_page(**kwargs)
-            kwargs["json"] = get_payload(get_query_variables(current_page + 1))
+        def parse_items(query, data):
+            return parse_page(self.metrics, query, data)
 
-            return kwargs
+        return run_plan(
+            query,
+            fetch_page,
+            workers=workers,
+            max_results=max_results,
+            parse_items=parse_items,
+            incomplete=incomplete,
+        )
 
-        def is_done(items, res, **kwargs):
-            if not items:
-                return True
-            items_count = len(items)
+    def search_many(self, specs, workers=4, requests_per_second=None):
+        """
+        Runs several searches over this client's session, `workers` at a time. Each
+        spec is a dict of search's filter arguments (not its fetch options). A listing returned by more than one search
+        is parsed once and shared between searches requesting the same fields with the
+        same `lazy` setting. Returns a SearchManyResult with the listings of each spec
+        and the merged listings, de-duplicated by id.
+        """
+        rate_limiter = RateLimiter(requests_per_second)
+        # A listing parsed from a projected response only has the projected fields
+        listings_by_projection = {}
+
+        def run(spec):
+            query = get_search_query("search_many", **spec)
+            projection = (tuple(query.get_requested_fields() or ()), query.lazy)
+            pages = self._iter_pages(
+                "",
+                query,
+                listings_by_projection.setdefault(projection, {}),
+                rate_limiter=rate_limiter,
+                evade=lambda: None,
+            )
+            return [listing for page in pages for listing in page]
 
-            if limit > -1 and items_count >= limit:
-                return True
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(run, specs))
 
-            # Sold Listings Limit (Sold listings accumulate indefinetely. Enables data from X most recent sold listings only)
-            if channel == "sold" and sold_limit > -1 and items_count >= sold_limit:
-                return True
+        return SearchManyResult(
+            results=results,
+            listings=dedupe_listings(chain.from_iterable(results)),
+        )
 
-            data = res.json()
-            results = (
-                data.get("data", {}).get(f"{channel}Search", {}).get("results", {})
-            )
+    def sync(self, index, **kwargs):
+        """
+        Accepts search's filter arguments (not workers, requests_per_second or
+        parse_processes). Returns a SyncResult of the listings added,
+        changed and removed since this search was last synced into `index` (a
+        ListingIndex). Sold searches sorted by "new-desc" stop paging at the first page
+        holding already indexed listings. Listings are only reported as removed when
+        paging ran to the end of the results, not when it stopped early or at a limit.
+        """
+        from realestate_com_au.sync import get_scope, sync_pages
+
+        query = get_search_query("sync", **kwargs)
+        stop_at_seen = query.channel == "sold" and query.sort_type == "new-desc"
+        return sync_pages(
+            self._iter_pages("", query),
+            index,
+            get_scope(query),
+            stop_at_seen,
+            query.target_count,
+        )
 
-            pagination = results.get("pagination")
-            if not pagination.get("moreResultsAvailable"):
-                return True
+    def create_job(self, store, job_id=None, **kwargs):
+        """
+        Records a search (search's filter arguments, not workers, requests_per_second
+        or parse_processes) as a resumable job in `store`, a JobStore. Returns the job
+        id to pass to resume.
+        """
+        return store.create(get_search_query("create_job", **kwargs), job_id)
+
+    def resume(self, store, job_id):
+        """
+        Yields a job's listings, continuing where it stopped. A listing counts as
+        emitted once the next one is requested, so one being handled when iteration
+        stops is yielded again on resume. Emitted ids are saved to `store` with each
+        completed page, or when the generator is closed part way through a page (e.g.
+        by a break). After a crash that skips closing the generator, the interrupted
+        page's listings may be yielded again.
+        """
+        query, page, items_count, done = store.get(job_id)
+        if done:
+            return
+        emitted_ids = store.get_emitted_ids(job_id)
+        while not done:
+            page += 1
+            data = self._fetch_page("", query, page)
+            items = parse_page(self.metrics, query, data)
+            items_count += len(items)
+            listing_ids = []
+            try:
+                for listing in items:
+                    if listing.id in emitted_ids:
+                        continue
+                    yield listing
+                    # The next listing was requested, so this one has been handled
+                    listing_ids.append(listing.id)
+                    emitted_ids.add(listing.id)
+            except GeneratorExit:
+                store.add_emitted_ids(job_id, listing_ids)
+                raise
+
+            done = query.is_done(items_count, data)
+            store.checkpoint(job_id, page, items_count, listing_ids, done=done)
+
+    def _iter_pages(self, uri, query, listings_by_id=None, **kwargs):
+        page = 1
+        items_count = 0
+        while True:
+            data = self._fetch_page(uri, query, page, **kwargs)
+            items = parse_page(self.metrics, query, data, listings_by_id)
+            items_count += len(items)
+            yield items
+
+            if query.is_done(items_count, data):
+                return
+            page += 1
+
+    def _fetch_page(self, uri, query, page, rate_limiter=None, **kwargs):
+        """
+        Returns the decoded response for one search page, from the cache when possible.
+        """
+        stats = FetchStats(query.channel, page)
+        body = self._get_page_body(uri, query, page, stats, rate_limiter, **kwargs)
+        start = perf_counter()
+        data = self.json_backend.loads(body)
+        stats.decode_seconds = perf_counter() - start
+        if (
+            not stats.cache_hit
+            and query.persisted_query
+            and query.is_persisted_query_miss(data)
+        ):
+            stats.retries += 1
+            body = self._get_page_body(
+                uri, query, page, stats, rate_limiter, send_document=True, **kwargs
+            )
+            start = perf_counter()
+            data = self.json_backend.loads(body)
+            stats.decode_seconds += perf_counter() - start
+        self._cache_page_body(query, page, stats, body)
+        self.metrics.page_fetched(stats)
+        return data
+
+    def _get_page_body(
+        self, uri, query, page, stats, rate_limiter=None, send_document=False, **kwargs
+    ):
+        """
+        Returns the undecoded response body for one search page, from the cache when
+        possible. Cache hits and request stats are recorded in `stats`.
+        """
+        if self.cache and not send_document:
+            body = self.cache.get(query.get_cache_variables(page))
+            if body is not None:
+                stats.cache_hit = True
+                stats.response_bytes = len(body)
+                return body
+
+        if rate_limiter:
+            rate_limiter.wait()
+        payload = self.json_backend.dumps(query.get_payload(page, send_document))
+        start = perf_counter()
+        res = self._post(uri, data=payload, **kwargs)
+        stats.latency += perf_counter() - start
+        stats.request_bytes += len(payload)
+        stats.response_bytes += len(res.content)
+        stats.status_code = res.status_code
+        self.logger.debug(
+            "%s page %s: HTTP %s, %s bytes in %.2fs",
+            query.channel,
+            page,
+            res.status_code,
+            len(res.content),
+            stats.latency,
+        )
+        return res.content
 
-            return False
+    def _cache_page_body(self, query, page, stats, body):
+        if self.cache and not stats.cache_hit and stats.status_code == 200:
+            self.cache.set(query.get_cache_variables(page), body)
 
-        listings = self._scroll(
-            "",
-            "POST",
-            parse_items,
-            next_page,
-            is_done,
-            json=get_payload(get_query_variables(1)),
+    def _scroll_concurrent(
+        self, uri, query, workers, requests_per_second=None, parse_processes=None
+    ):
+        """
+        Returns listings in page order, de-duplicated by id. See _iter_pages_concurrent.
+        """
+        pages = self._iter_pages_concurrent(
+            uri, query, workers, requests_per_second, parse_processes
         )
+        return dedupe_listings(chain.from_iterable(pages))
 
-        return listings
+    def _iter_pages_concurrent(
+        self,
+        uri,
+        query,
+        workers,
+        requests_per_second=None,
+        parse_processes=None,
+        batches=False,
+    ):
+        """
+        Fetch page 1, read the page count from its pagination, then fetch the
+        remaining pages concurrently. Pages are fetched in waves sized to reach
+        the query's target count, and each page's listings are yielded in page
+        order, with at most 2 * (workers + parse_processes) pages fetched ahead of
+        the consumer. With parse_processes, the remaining pages' bodies are decoded and
+        parsed by a pool of that many processes while the threads go on fetching.
+        With batches, pages are yielded as ListingBatches, which are much cheaper
+        than Listings to send between processes.
+        """
+        rate_limiter = RateLimiter(requests_per_second)
+        # A single worker sends one request at a time, so it keeps the default delay
+        # between requests
+        kwargs = {} if workers == 1 else {"evade": lambda: None}
+
+        data = self._fetch_page(uri, query, 1, rate_limiter=rate_limiter, **kwargs)
+        items = parse_page(self.metrics, query, data)
+        items_count = len(items)
+        yield ListingBatch(items) if batches else items
+        if query.is_done(items_count, data):
+            return
+
+        with ExitStack() as stack:
+            executor = stack.enter_context(ThreadPoolExecutor(max_workers=workers))
+            if parse_processes:
+                import multiprocessing
+                from concurrent.futures import ProcessPoolExecutor
+
+                parse_pool = stack.enter_context(
+                    ProcessPoolExecutor(
+                        max_workers=parse_processes,
+                        mp_context=multiprocessing.get_context("spawn"),
+                    )
+                )
+
+                def fetch_page(page):
+                    return self._fetch_page_for_pool(
+                        uri, query, page, parse_pool, batches, rate_limiter, **kwargs
+                    )
+
+                def get_items(fetched):
+                    return self._get_pool_parsed_items(
+                        uri,
+                        query,
+                        parse_pool,
+                        batches,
+                        rate_limiter,
+                        *fetched,
+                        **kwargs,
+                    )
+
+            else:
+
+                def fetch_page(page):
+                    page_data = self._fetch_page(
+                        uri, query, page, rate_limiter=rate_limiter, **kwargs
+                    )
+                    items = parse_page(self.metrics, query, page_data)
+                    return ListingBatch(items) if batches else items
+
+                def get_items(fetched):
+                    return fetched
+
+            # Pages fetched or parsed but not yet yielded are held in memory, so only
+            # a window of them is in flight at a time
+            max_pending = 2 * (workers + (parse_processes or 0))
+            page = 2
+            while True:
+                pages = query.get_page_range(items_count, data, page)
+                if not pages:
+                    break
+                pending = deque(
+                    executor.submit(fetch_page, page) for page in pages[:max_pending]
+                )
+                next_pages = iter(pages[max_pending:])
+                while pending:
+                    items = get_items(pending.popleft().result())
+                    next_page = next(next_pages, None)
+                    if next_page is not None:
+                        pending.append(executor.submit(fetch_page, next_page))
+                    items_count += len(items)
+                    yield items
+                page = pages[-1] + 1
+
+    def _fetch_page_for_pool(
+        self, uri, query, page, parse_pool, batches, rate_limiter, **kwargs
+    ):
+        """
+        Fetches one search page's body and submits it to `parse_pool` to be decoded and
+        parsed, without waiting, so the fetching thread moves on to its next page while
+        the pool parses this one. Returns the page's FetchStats, body and parse future.
+        """
+        from realestate_com_au.pipeline import parse_body
+
+        stats = FetchStats(query.channel, page)
+        body = self._get_page_body(uri, query, page, stats, rate_limiter, **kwargs)
+        backend = self.json_backend.name
+        return stats, body, parse_pool.submit(parse_body, query, body, backend, batches)
+
+    def _get_pool_parsed_items(
+        self,
+        uri,
+        query,
+        parse_pool,
+        batches,
+        rate_limiter,
+        stats,
+        body,
+        parsed,
+        **kwargs,
+    ):
+        """
+        Waits for a page submitted by _fetch_page_for_pool to be parsed and returns its
+        listings, re-sending the request with the document after a persisted query
+        miss.
+        """
+        from realestate_com_au.pipeline import parse_body
+
+        parsed = parsed.result()
+        if parsed is None:  # persisted query miss
+            stats.retries += 1
+            body = self._get_page_body(
+                uri,
+                query,
+                stats.page,
+                stats,
+                rate_limiter,
+                send_document=True,
+                **kwargs,
+            )
+            backend = self.json_backend.name
+            parsed = parse_pool.submit(
+                parse_body, query, body, backend, batches
+            ).result()
+        self._cache_page_body(query, stats.page, stats, body)
+        stats.decode_seconds = parsed.decode_seconds if parsed else 0.0
+        self.metrics.page_fetched(stats)
+        if parsed is None:
+            return ListingBatch() if batches else []
+        self.metrics.page_parsed(
+            ParseStats(
+                query.channel, stats.page, len(parsed.items), parsed.parse_seconds
+            )
+        )
+        return parsed.items
 
     """
     Returns true if form was submitted successfully.
@@ -243,14 +602,9 @@ class RealestateComAu(Fajita):
         subject="",
         from_phone="",
     ):
-        payload = {
-            "lookingTo": subject,
-            "name": from_name,
-            "fromAddress": from_address,
-            "fromPhone": from_phone,
-            "message": message,
-            "likeTo": [],
-        }
+        payload = get_contact_agent_payload(
+            from_address, from_name, message, subject=subject, from_phone=from_phone
+        )
 
         res = self._post(
             f"/contact-agent/listing/{listing_id}",
@@ -0,0 +1,200 @@
+"""
+Request scheduling: per-host adaptive rate limits, retries with backoff and proxy/user
+agent rotation
+"""
+
+import logging
+import random
+import threading
+import time
+from urllib.parse import urlparse
+
+import requests
+
+import realestate_com_au.settings as settings
+from realestate_com_au.metrics import NO_METRICS
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+# Responses suggesting the proxy or user agent has been blocked
+BLOCKED_STATUS_CODES = (401, 403)
+
+
+class TokenBucket:
+    """
+    Token bucket allowing bursts of `burst` requests at up to `rate` requests/sec.
+    The rate adapts between min_rate and max_rate: halved when throttled, and raised
+    by `increase` on each success.
+    """
+
+    def __init__(self, rate=2, burst=4, min_rate=0.2, max_rate=None, increase=0.05):
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate or rate
+        self.increase = increase
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.burst, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait_time = (1 - self._tokens) / self.rate
+            time.sleep(wait_time)
+
+    def throttled(self):
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+            self._tokens = 0
+
+    def succeeded(self):
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.increase)
+
+
+class ProxyPool:
+    """
+    Rotates across proxies (requests-style proxies dicts, or None for a direct
+    connection), preferring healthy, fast ones. Each proxy's score is a moving average
+    of its outcomes, with responses slower than slow_seconds scoring below min_score,
+    so a consistently slow proxy gets benched. A proxy that is throttled or blocked, or
+    whose score drops below min_score, is benched for ban_seconds.
+    """
+
+    def __init__(
+        self, proxies=(None,), slow_seconds=10, min_score=0.3, ban_seconds=120
+    ):
+        self.entries = [
+            {"proxies": proxies, "score": 1.0, "banned_until": 0} for proxies in proxies
+        ]
+        self.slow_seconds = slow_seconds
+        self.min_score = min_score
+        self.ban_seconds = ban_seconds
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            now = time.monotonic()
+            available = [e for e in self.entries if e["banned_until"] <= now]
+            if not available:
+                return min(self.entries, key=lambda e: e["banned_until"])
+            return random.choices(available, weights=[e["score"] for e in available])[0]
+
+    def report(self, entry, ok, elapsed=0, throttled=False):
+        outcome = 0.0
+        if ok:
+            outcome = self.min_score / 2 if elapsed > self.slow_seconds else 1.0
+        with self._lock:
+            entry["score"] = 0.8 * entry["score"] + 0.2 * outcome
+            if throttled or entry["score"] < self.min_score:
+                logger.debug("Benching proxy %s", entry["proxies"])
+                entry["banned_until"] = time.monotonic() + self.ban_seconds
+                entry["score"] = 0.5  # probation once the ban ends
+
+
+class RequestScheduler:
+    """
+    Sends requests through a per-host TokenBucket, retrying 429/5xx responses and
+    connection errors up to max_retries times with jittered exponential backoff
+    (honouring Retry-After). Each attempt uses a proxy from `proxy_pool` and a random
+    user agent from `user_agents`. 401/403 responses are returned without retrying,
+    and bench the proxy that got them.
+    """
+
+    def __init__(
+        self,
+        rate=2,
+        burst=4,
+        max_retries=5,
+        backoff=1,
+        max_backoff=60,
+        proxy_pool=None,
+        user_agents=settings.USER_AGENTS,
+        timeout=30,
+        metrics=NO_METRICS,  # realestate_com_au.metrics.Metrics
+    ):
+        self.rate = rate
+        self.burst = burst
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.proxy_pool = proxy_pool or ProxyPool()
+        self.user_agents = user_agents
+        self.timeout = timeout
+        self.metrics = metrics
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def get_bucket(self, url):
+        host = urlparse(url).netloc
+        with self._lock:
+            if host not in self._buckets:
+                self._buckets[host] = TokenBucket(self.rate, self.burst)
+            return self._buckets[host]
+
+    def get_backoff(self, attempt, res=None):
+        retry_after = res is not None and res.headers.get("retry-after")
+        if retry_after and retry_after.isdigit():
+            return min(self.max_backoff, int(retry_after))
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2**attempt))
+
+    def request(self, send, url, **kwargs):
+        """
+        Calls send(url, **kwargs), e.g. session.post, until it succeeds or retries run
+        out. Returns the last response, or raises the last connection error.
+        """
+        bucket = self.get_bucket(url)
+        kwargs.setdefault("timeout", self.timeout)
+        for attempt in range(self.max_retries + 1):
+            entry = self.proxy_pool.acquire()
+            if entry["proxies"] is not None:
+                kwargs["proxies"] = entry["proxies"]
+            else:
+                kwargs.pop("proxies", None)  # left by an attempt through a proxy
+            if self.user_agents:
+                kwargs["headers"] = {
+                    **kwargs.get("headers", {}),
+                    "user-agent": random.choice(self.user_agents),
+                }
+
+            bucket.wait()
+            start = time.monotonic()
+            try:
+                res = send(url, **kwargs)
+            except requests.RequestException as e:
+                self.proxy_pool.report(entry, ok=False)
+                if attempt == self.max_retries:
+                    raise
+                logger.debug("Request to %s failed (%s), retrying", url, e)
+                self.metrics.request_retried(url, attempt + 1, e)
+                time.sleep(self.get_backoff(attempt))
+                continue
+
+            elapsed = time.monotonic() - start
+            throttled = res.status_code == 429
+            if res.status_code in BLOCKED_STATUS_CODES:
+                self.proxy_pool.report(entry, ok=False, throttled=True)
+                return res
+            if res.status_code not in RETRY_STATUS_CODES:
+                bucket.succeeded()
+                self.proxy_pool.report(entry, ok=True, elapsed=elapsed)
+                return res
+
+            if throttled:
+                bucket.throttled()
+            self.proxy_pool.report(entry, ok=False, throttled=throttled)
+            if attempt == self.max_retries:
+                return res
+            logger.debug("Request to %s got %s, retrying", url, res.status_code)
+            self.metrics.request_retried(url, attempt + 1, res.status_code)
+            time.sleep(self.get_backoff(attempt, res))
@@ -0,0 +1,183 @@
+"""
+Local SQLite store of listings, queried offline with search's filter vocabulary
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import fields
+
+from realestate_com_au.export import listing_from_dict, listing_to_dict
+from realestate_com_au.objects.listing import Listing
+from realestate_com_au.objects.listing_batch import MEDIA_FIELDS, NESTED_FIELDS
+
+COLUMNS = tuple(
+    f.name for f in fields(Listing) if f.name not in MEDIA_FIELDS + NESTED_FIELDS
+)
+INDEXED_COLUMNS = ("postcode", "suburb", "property_type", "price", "bedrooms")
+SORT_ORDERS = {
+    "price-asc": "price IS NULL, price ASC",
+    "price-desc": "price IS NULL, price DESC",
+    "new-desc": "updated DESC",
+    "new-asc": "updated ASC",
+}
+
+
+def get_match_query(keywords, operator):
+    """FTS5 query matching each keyword as a phrase, joined by AND or OR."""
+    return f" {operator} ".join(
+        '"' + keyword.replace('"', '""') + '"' for keyword in keywords
+    )
+
+
+class ListingStore:
+    """
+    Listings upserted by id into an SQLite file (or memory), with indexes on the
+    commonly filtered columns and an FTS5 index of descriptions.
+    """
+
+    def __init__(self, path=":memory:"):
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        columns = ", ".join(c if c != "id" else "id TEXT UNIQUE" for c in COLUMNS)
+        self._db.executescript(
+            f"CREATE TABLE IF NOT EXISTS listings ({columns}, nested TEXT, updated REAL);"
+            + "".join(
+                f"CREATE INDEX IF NOT EXISTS listings_{column} ON listings ({column});"
+                for column in INDEXED_COLUMNS
+            )
+            + "CREATE VIRTUAL TABLE IF NOT EXISTS listings_fts USING fts5("
+            "description, content='listings', content_rowid='rowid');"
+            "CREATE TRIGGER IF NOT EXISTS listings_ai AFTER INSERT ON listings BEGIN "
+            "INSERT INTO listings_fts(rowid, description) "
+            "VALUES (new.rowid, new.description); END;"
+            "CREATE TRIGGER IF NOT EXISTS listings_ad AFTER DELETE ON listings BEGIN "
+            "INSERT INTO listings_fts(listings_fts, rowid, description) "
+            "VALUES ('delete', old.rowid, old.description); END;"
+            "CREATE TRIGGER IF NOT EXISTS listings_au AFTER UPDATE ON listings BEGIN "
+            "INSERT INTO listings_fts(listings_fts, rowid, description) "
+            "VALUES ('delete', old.rowid, old.description); "
+            "INSERT INTO listings_fts(rowid, description) "
+            "VALUES (new.rowid, new.description); END;"
+        )
+        self._db.commit()
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM listings").fetchone()[0]
+
+    def upsert(self, listings):
+        """
+        Inserts listings (e.g. search results), replacing stored listings with the
+        same id. Returns the number written.
+        """
+        updated = time.time()
+        rows = []
+        for listing in listings:
+            row = listing_to_dict(listing)
+            nested = {name: row.pop(name) for name in MEDIA_FIELDS + NESTED_FIELDS}
+            nested = json.dumps(nested, ensure_ascii=False)
+            rows.append((*row.values(), nested, updated))
+
+        placeholders = ", ".join("?" * (len(COLUMNS) + 2))
+        updates = ", ".join(f"{c} = excluded.{c}" for c in COLUMNS[1:])
+        with self._lock:
+            self._db.executemany(
+                f"INSERT INTO listings ({', '.join(COLUMNS)}, nested, updated) "
+                f"VALUES ({placeholders}) "
+                f"ON CONFLICT (id) DO UPDATE SET {updates}, nested = excluded.nested, "
+                "updated = excluded.updated",
+                rows,
+            )
+            self._db.commit()
+        return len(rows)
+
+    def get(self, listing_id):
+        listings = self._select("WHERE id = ?", (listing_id,))
+        return listings[0] if listings else None
+
+    def delete(self, listing_ids):
+        with self._lock:
+            self._db.executemany(
+                "DELETE FROM listings WHERE id = ?", [(i,) for i in listing_ids]
+            )
+            self._db.commit()
+
+    def query(
+        self,
+        limit=-1,
+        postcodes=[],
+        suburbs=[],
+        states=[],
+        min_price=0,
+        max_price=-1,
+        min_bedrooms=0,
+        max_bedrooms=-1,
+        property_types=[],
+        min_bathrooms=0,
+        min_carspaces=0,
+        min_land_size=0,
+        keywords=[],  # descriptions must contain all of these words or phrases
+        exclude_keywords=[],  # descriptions must contain none of these
+        sort_type=None,  # "price-asc", "price-desc", "new-desc" or "new-asc"
+    ):
+        """
+        Returns the stored listings matching every given filter. Price and land size
+        filters skip listings without a price or land size.
+        """
+        conditions, params = [], []
+
+        def add(condition, *values):
+            conditions.append(condition)
+            params.extend(values)
+
+        def add_in(column, values):
+            if values:
+                placeholders = ", ".join("?" * len(values))
+                add(f"{column} IN ({placeholders})", *values)
+
+        add_in("postcode", postcodes)
+        add_in("suburb COLLATE NOCASE", suburbs)
+        add_in("state COLLATE NOCASE", states)
+        add_in("property_type", property_types)
+        if min_price > 0:
+            add("price >= ?", min_price)
+        if max_price > -1:
+            add("price <= ?", max_price)
+        if min_bedrooms > 0:
+            add("bedrooms >= ?", min_bedrooms)
+        if max_bedrooms > -1:
+            add("bedrooms <= ?", max_bedrooms)
+        if min_bathrooms > 0:
+            add("bathrooms >= ?", min_bathrooms)
+        if min_carspaces > 0:
+            add("parking_spaces >= ?", min_carspaces)
+        if min_land_size > 0:
+            add("land_size >= ?", min_land_size)
+        if keywords:
+            add(
+                "rowid IN (SELECT rowid FROM listings_fts WHERE listings_fts MATCH ?)",
+                get_match_query(keywords, "AND"),
+            )
+        if exclude_keywords:
+            add(
+                "rowid NOT IN "
+                "(SELECT rowid FROM listings_fts WHERE listings_fts MATCH ?)",
+                get_match_query(exclude_keywords, "OR"),
+            )
+
+        clauses = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        clauses += f" ORDER BY {SORT_ORDERS.get(sort_type, 'rowid')} LIMIT ?"
+        return self._select(clauses, (*params, limit))
+
+    def _select(self, clauses, params):
+        with self._lock:
+            cursor = self._db.execute(
+                f"SELECT {', '.join(COLUMNS)}, nested FROM listings {clauses}", params
+            )
+            rows = cursor.fetchall()
+        return [
+            listing_from_dict({**dict(zip(COLUMNS, row)), **json.loads(row[-1])})
+            for row in rows
+        ]
@@ -0,0 +1,127 @@
+"""
+Incremental sync of search results against a local listing fingerprint index
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+from dataclasses import dataclass, field
+
+
+@dataclass
+class SyncResult:
+    added: list = field(default_factory=list)  # Listings not seen on the last run
+    changed: list = field(default_factory=list)  # Listings whose fingerprint changed
+    removed: list = field(
+        default_factory=list
+    )  # ids no longer returned. Empty when the run stopped early
+    unchanged_count: int = 0
+    complete: bool = True  # False when paging stopped at seen listings or a limit
+
+
+def get_fingerprint(listing):
+    """
+    Hash of the listing fields that change over a listing's life.
+    """
+    description = listing.description or ""
+    parts = [
+        listing.price_text,
+        listing.badge,
+        listing.sold_date,
+        listing.auction_date,
+        listing.available_date,
+        [(i.start_time, i.end_time) for i in listing.inspections],
+        [lister.id for lister in listing.listers],
+        len(listing.images),
+        hashlib.sha1(description.encode()).hexdigest(),
+    ]
+    return hashlib.sha1(json.dumps(parts, default=str).encode()).hexdigest()
+
+
+def get_scope(query):
+    """
+    Identifies a saved search: its query variables without the page number.
+    """
+    query_variables = query.get_query_variables(1)
+    del query_variables["page"]
+    canonical = json.dumps(query_variables, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class ListingIndex:
+    """
+    Listing id -> fingerprint, per search scope. Kept in memory, or in the SQLite file
+    at `path` so it survives between runs.
+    """
+
+    def __init__(self, path=":memory:"):
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS fingerprints ("
+            "scope TEXT, id TEXT, fingerprint TEXT, PRIMARY KEY (scope, id))"
+        )
+        self._db.commit()
+
+    def get(self, scope):
+        with self._lock:
+            return dict(
+                self._db.execute(
+                    "SELECT id, fingerprint FROM fingerprints WHERE scope = ?",
+                    (scope,),
+                ).fetchall()
+            )
+
+    def update(self, scope, fingerprints, removed_ids=()):
+        with self._lock:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO fingerprints VALUES (?, ?, ?)",
+                [(scope, id, fp) for id, fp in fingerprints.items()],
+            )
+            self._db.executemany(
+                "DELETE FROM fingerprints WHERE scope = ? AND id = ?",
+                [(scope, id) for id in removed_ids],
+            )
+            self._db.commit()
+
+
+def sync_pages(pages, index, scope, stop_at_seen=False, target_count=-1):
+    """
+    Compares pages of Listings with the index and records the new fingerprints.
+    With stop_at_seen, stops consuming pages after the first page that contains an
+    already indexed listing (for newest-first result orders). Pages that reach
+    target_count (the query's limit) are assumed to have stopped before the results
+    ran out. In both cases no listings are reported as removed.
+    """
+    known = index.get(scope)
+    result = SyncResult()
+    fingerprints = {}
+    items_count = 0
+    for page in pages:
+        items_count += len(page)
+        reached_seen = False
+        for listing in page:
+            if listing.id in fingerprints:
+                continue
+            fingerprint = get_fingerprint(listing)
+            fingerprints[listing.id] = fingerprint
+            previous = known.get(listing.id)
+            if previous is None:
+                result.added.append(listing)
+            elif previous != fingerprint:
+                result.changed.append(listing)
+                reached_seen = True
+            else:
+                result.unchanged_count += 1
+                reached_seen = True
+        if stop_at_seen and reached_seen:
+            result.complete = False
+            break
+
+    if target_count > -1 and items_count >= target_count:
+        result.complete = False
+    if result.complete:
+        result.removed = [id for id in known if id not in fingerprints]
+    index.update(scope, fingerprints, result.removed)
+    return result
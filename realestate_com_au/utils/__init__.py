@@ -1,3 +1,10 @@
+import logging
+import random
+import threading
+import time
+from importlib import import_module
+
+
 def delete_nulls(obj):
     new_obj = {}
     for key, val in obj.items():
@@ -7,3 +14,64 @@ def delete_nulls(obj):
             else:
                 new_obj[key] = val
     return new_obj
+
+
+def import_optional(name, feature, extra):
+    """
+    Imports the optional dependency `name` (e.g. "pyarrow.parquet"), raising an
+    ImportError that says how to install it when it is missing.
+    """
+    try:
+        return import_module(name)
+    except ImportError as e:
+        package = name.split(".")[0]
+        raise ImportError(
+            f"{feature} requires {package}: pip install {package} "
+            f"(or the {extra} extra)"
+        ) from e
+
+
+class ClientLogger(logging.LoggerAdapter):
+    """
+    Logs through a module logger, adding the client's id to each record as `client`.
+    DEBUG records are only logged for clients created with debug=True; whether they
+    are shown is up to the application's logging configuration.
+    """
+
+    def __init__(self, logger, client, debug=False):
+        super().__init__(logger, {"client": f"{id(client):x}"})
+        self.debug_enabled = debug
+
+    def isEnabledFor(self, level):
+        if level < logging.INFO and not self.debug_enabled:
+            return False
+        return super().isEnabledFor(level)
+
+
+def default_evade():
+    """
+    Delays a request by a random 2-5 seconds to avoid being throttled or blocked.
+    """
+    time.sleep(random.randint(2, 5))
+
+
+class RateLimiter:
+    """
+    Thread-safe limiter that spaces calls to `wait` at least 1 / rate seconds apart.
+    A rate of None disables limiting.
+    """
+
+    def __init__(self, rate=None):
+        self._interval = 1 / rate if rate else 0
+        self._lock = threading.Lock()
+        self._next_time = 0
+
+    def wait(self):
+        if not self._interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            wait_time = self._next_time - now
+            self._next_time = max(now, self._next_time) + self._interval
+        if wait_time > 0:
+            time.sleep(wait_time)
@@ -0,0 +1,120 @@
+import json
+
+import pytest
+
+
+def make_listing(listing_id, description="", price="$500,000"):
+    return {
+        "id": str(listing_id),
+        "badge": None,
+        "_links": {
+            "canonical": {"href": f"https://www.realestate.com.au/{listing_id}"}
+        },
+        "address": {
+            "suburb": "Seventeen Seventy",
+            "state": "QLD",
+            "postcode": "4677",
+            "display": {"shortAddress": "1 Test St", "fullAddress": None},
+        },
+        "propertyType": {"id": "house"},
+        "generalFeatures": {"bedrooms": {"value": 3}, "bathrooms": {"value": 2}},
+        "propertySizes": {"land": {"displayValue": "1,200", "sizeUnit": None}},
+        "price": {"display": price},
+        "description": description,
+        "media": {"images": [{"templatedUrl": "https://i.test/{size}/1.jpg"}]},
+        "listers": [{"id": "1", "name": "Agent", "preferredPhoneNumber": "0400 000"}],
+        "inspections": [],
+    }
+
+
+class FakeResponse:
+    def __init__(self, data, status_code=200, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.content = json.dumps(data).encode()
+        self.text = self.content.decode()
+
+    def json(self):
+        return json.loads(self.content)
+
+
+def make_search_response(channel, items, page, max_page, page_size=25):
+    return {
+        "data": {
+            f"{channel}Search": {
+                "results": {
+                    "totalResultsCount": max_page * page_size,
+                    "pagination": {
+                        "page": page,
+                        "pageSize": page_size,
+                        "maxPageNumberAvailable": max_page,
+                        "moreResultsAvailable": page < max_page,
+                    },
+                    "exact": {"items": [{"listing": item} for item in items]},
+                    "surrounding": None,
+                }
+            }
+        }
+    }
+
+
+@pytest.fixture
+def fake_site():
+    """
+    Serves `pages` of synthetic listings to RealestateComAu._post and records
+    the pages requested.
+    """
+
+    class FakeSite:
+        def __init__(self, pages=3, page_size=25, channel="buy"):
+            self.pages = pages
+            self.page_size = page_size
+            self.channel = channel
+            self.requested = []
+
+        def page_items(self, page):
+            start = (page - 1) * self.page_size
+            return [make_listing(i) for i in range(start, start + self.page_size)]
+
+        def post(self, uri, evade=None, **kwargs):
+            payload = json.loads(kwargs["data"])
+            page = json.loads(payload["variables"]["query"])["page"]
+            self.requested.append(page)
+            items = self.page_items(page) if page <= self.pages else []
+            return FakeResponse(
+                make_search_response(
+                    self.channel, items, page, self.pages, self.page_size
+                )
+            )
+
+        def install(self, api):
+            api._post = self.post
+            return api
+
+        def session(self):
+            site = self
+
+            class FakeAsyncResponse:
+                def __init__(self, res):
+                    self.res = res
+                    self.status = res.status_code
+
+                async def __aenter__(self):
+                    return self
+
+                async def __aexit__(self, *exc_info):
+                    pass
+
+                async def read(self):
+                    return self.res.content
+
+                async def json(self, content_type=None):
+                    return self.res.json()
+
+            class FakeSession:
+                def post(self, url, proxy=None, **kwargs):
+                    return FakeAsyncResponse(site.post(url, **kwargs))
+
+            return FakeSession()
+
+    return FakeSite
@@ -0,0 +1,16 @@
+import asyncio
+
+from realestate_com_au import AsyncRealestateComAu, RealestateComAu
+
+
+def test_async_search_matches_sync(fake_site):
+    site = fake_site(pages=4)
+    sync_listings = site.install(RealestateComAu()).search()
+
+    async def run():
+        async with AsyncRealestateComAu(session=site.session()) as api:
+            return await api.search(), await api.search(workers=3)
+
+    sequential, concurrent = asyncio.run(run())
+    assert [l.id for l in sequential] == [l.id for l in sync_listings]
+    assert [l.id for l in concurrent] == [l.id for l in sync_listings]
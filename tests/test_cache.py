@@ -0,0 +1,42 @@
+import time
+
+from realestate_com_au import RealestateComAu
+from realestate_com_au.cache import ResponseCache
+
+
+def test_cache_hits_skip_network(fake_site, tmp_path):
+    site = fake_site(pages=2)
+    cache = ResponseCache(path=str(tmp_path / "cache.sqlite"))
+    api = site.install(RealestateComAu(cache=cache))
+    first = api.search()
+    second = api.search()
+    assert [l.id for l in first] == [l.id for l in second]
+    assert site.requested == [1, 2]
+
+    # a fresh memory layer is served from disk
+    api = site.install(
+        RealestateComAu(cache=ResponseCache(str(tmp_path / "cache.sqlite")))
+    )
+    api.search()
+    assert site.requested == [1, 2]
+
+
+def test_cache_expires_per_channel(monkeypatch):
+    cache = ResponseCache(ttls={"buy": 10})
+    now = time.time()
+    cache.set({"channel": "buy", "page": 1}, b"buy")
+    cache.set({"channel": "sold", "page": 1}, b"sold")
+    monkeypatch.setattr(time, "time", lambda: now + 60)
+    assert cache.get({"channel": "buy", "page": 1}) is None
+    assert cache.get({"page": 1, "channel": "sold"}) == b"sold"
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = ResponseCache(
+        str(tmp_path / "cache.sqlite"), max_bytes=300, memory_entries=0
+    )
+    bodies = {page: bytes(range(256)) * 2 for page in range(2)}
+    cache.set({"channel": "buy", "page": 0}, bodies[0])
+    cache.set({"channel": "buy", "page": 1}, bodies[1])
+    assert cache.get({"channel": "buy", "page": 0}) is None
+    assert cache.get({"channel": "buy", "page": 1}) == bodies[1]
@@ -0,0 +1,61 @@
+import csv
+import json
+import sys
+
+import pytest
+
+from realestate_com_au.export import export_listings
+from realestate_com_au.objects.listing import get_listing
+
+from conftest import make_listing
+
+
+def get_listings(start=0, n=25):
+    return (get_listing(make_listing(i)) for i in range(start, start + n))
+
+
+def test_export_ndjson_appends(tmp_path):
+    path = str(tmp_path / "listings.ndjson")
+    assert export_listings(get_listings(), path, chunk_size=10) == 25
+    export_listings(get_listings(25, 5), path, append=True)
+    with open(path) as f:
+        rows = [json.loads(line) for line in f]
+    assert [row["id"] for row in rows] == [str(i) for i in range(30)]
+    assert rows[0]["listers"][0]["phone"] == "0400000"
+
+
+def test_export_csv_appends_without_repeating_header(tmp_path):
+    path = str(tmp_path / "listings.csv")
+    export_listings(get_listings(n=3), path)
+    export_listings(get_listings(3, 2), path, append=True)
+    with open(path, newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert [row["id"] for row in rows] == ["0", "1", "2", "3", "4"]
+    assert json.loads(rows[0]["images"]) == [
+        "https://i.test/1144x888-format=webp/1.jpg"
+    ]
+
+
+def test_export_parquet_row_groups_and_append(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = str(tmp_path / "listings.parquet")
+    export_listings(get_listings(), path, chunk_size=10)
+    assert pq.ParquetFile(path).metadata.num_row_groups == 3
+    assert pq.read_table(path).column("price").to_pylist()[0] == 500000
+
+    dataset = str(tmp_path / "dataset")
+    export_listings(get_listings(), dataset, format="parquet", append=True)
+    export_listings(get_listings(25), dataset, format="parquet", append=True)
+    assert pq.read_table(dataset).num_rows == 50
+
+
+def test_export_unknown_format(tmp_path):
+    with pytest.raises(ValueError):
+        export_listings([], str(tmp_path / "listings.xml"))
+
+
+def test_export_parquet_without_pyarrow(tmp_path, monkeypatch):
+    monkeypatch.setitem(sys.modules, "pyarrow", None)
+    monkeypatch.setitem(sys.modules, "pyarrow.parquet", None)
+    with pytest.raises(ImportError, match="pip install pyarrow"):
+        export_listings(get_listings(), str(tmp_path / "listings.parquet"))
@@ -0,0 +1,38 @@
+from realestate_com_au import RealestateComAu
+from realestate_com_au.jobs import JobStore
+
+
+def test_resume_continues_after_last_completed_page(fake_site, tmp_path):
+    site = fake_site(pages=4, channel="sold")
+    api = site.install(RealestateComAu())
+    store = JobStore(str(tmp_path / "jobs.sqlite"))
+    job_id = api.create_job(store, channel="sold", sold_limit=1000, fields=["price"])
+
+    listings = api.resume(store, job_id)
+    first = [next(listings) for _ in range(60)]
+    listings.close()  # the process stops part way through page 3
+    assert site.requested == [1, 2, 3]
+
+    store = JobStore(str(tmp_path / "jobs.sqlite"))
+    rest = list(api.resume(store, job_id))
+    assert site.requested == [1, 2, 3, 3, 4]
+    # The 60th listing was still being handled, so it is yielded again
+    assert [l.id for l in first[:59] + rest] == [str(i) for i in range(100)]
+    assert list(api.resume(store, job_id)) == []
+
+
+def test_resume_after_break_yields_in_flight_listing(fake_site, tmp_path):
+    site = fake_site(pages=2)
+    api = site.install(RealestateComAu())
+    store = JobStore(str(tmp_path / "jobs.sqlite"))
+    job_id = api.create_job(store)
+
+    handled = []
+    for listing in api.resume(store, job_id):
+        if listing.id == "30":
+            break  # e.g. handling this listing failed
+        handled.append(listing.id)
+
+    rest = [listing.id for listing in api.resume(store, job_id)]
+    assert rest[0] == "30"
+    assert handled + rest == [str(i) for i in range(50)]
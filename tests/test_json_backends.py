@@ -0,0 +1,20 @@
+import pytest
+
+from realestate_com_au import RealestateComAu
+from realestate_com_au.json_backends import get_json_backend
+
+
+@pytest.mark.parametrize("name", ["json", "orjson", "msgspec"])
+def test_backends_parse_the_same_listings(fake_site, name):
+    pytest.importorskip(name)
+    site = fake_site(pages=2)
+    expected = site.install(RealestateComAu(json_backend="json")).search()
+    api = site.install(RealestateComAu(json_backend=name))
+    assert api.json_backend.name == name
+    assert api.search() == expected
+    assert get_json_backend(name).loads(get_json_backend(name).dumps([1])) == [1]
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        get_json_backend("simdjson")
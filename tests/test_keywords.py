@@ -0,0 +1,39 @@
+from realestate_com_au.keywords import KeywordMatcher, get_trie, get_trie_pattern
+from realestate_com_au.query import SearchQuery
+
+from conftest import make_listing, make_search_response
+
+
+def test_trie_pattern_factors_prefixes():
+    assert get_trie_pattern(get_trie(["pool", "pools", "porch"])) == (
+        "po(?:ol(?:s)?|rch)"
+    )
+
+
+def test_keyword_matcher():
+    matcher = KeywordMatcher(["pool", "$1m+", "a.b"])
+    assert matcher.search("Resort style pool")
+    assert matcher.search("Offers $1m+")
+    assert not matcher.search("axb")  # terms are literal, not regexes
+    assert not matcher.search("POOL")
+    assert not matcher.search(None)
+
+    assert KeywordMatcher(["Pool"], ignore_case=True).search("POOL")
+    whole_words = KeywordMatcher(["pool"], whole_words=True)
+    assert whole_words.search("a pool.") and not whole_words.search("poolside")
+
+
+def test_parse_items_excludes_before_parsing():
+    raw = [make_listing(1, "Has a pool"), make_listing(2, "Has a shed")]
+    data = make_search_response("buy", raw, 1, 1)
+    listings_by_id = {}
+    query = SearchQuery(exclude_keywords=["POOL"], exclude_ignore_case=True)
+    listings = query.parse_items(data, listings_by_id)
+    assert [listing.id for listing in listings] == ["2"]
+    assert list(listings_by_id) == ["2"]
+
+
+def test_projection_requests_description_for_exclude_keywords():
+    query = SearchQuery(fields=("price",), exclude_keywords=["pool"])
+    assert "description" in query.get_query()
+    assert query.get_cache_variables(1)["fields"] == ["description", "price"]
@@ -0,0 +1,67 @@
+from dataclasses import asdict, replace
+
+from realestate_com_au import RealestateComAu
+from realestate_com_au.objects.listing import (
+    LazyListing,
+    get_listing,
+    parse_price_text,
+)
+
+from conftest import make_listing
+
+
+def test_parse_price_text():
+    assert parse_price_text("$500,000 - $550,000") == 550000
+    assert parse_price_text("Offers over $1.2m") == 1200000
+    assert parse_price_text("$950k") == 950000
+    assert parse_price_text("Contact Agent") is None
+    assert parse_price_text(None) is None
+
+
+def test_get_listing_handles_nulls():
+    raw = make_listing(1)
+    raw.update(
+        badge={"label": "Under Contract"},
+        media={"images": None, "floorplans": [{"templatedUrl": "https://i/{size}"}]},
+        inspections=[{"startTime": "10:00", "endTime": None, "display": None}],
+        auction=None,
+    )
+    listing = get_listing(raw)
+    assert listing.badge == "Under Contract"
+    assert listing.full_address is None
+    assert listing.land_size == 1200.0
+    assert listing.land_size_unit is None
+    assert listing.price == 500000
+    assert listing.images == []
+    assert listing.images_floorplans[0].link == "https://i/1144x888-format=webp"
+    assert listing.inspections[0].label is None
+    assert listing.listers[0].phone == "0400000"
+    assert get_listing({}).land_size == -1.0
+
+
+def test_lazy_listing_matches_get_listing():
+    raw = make_listing(1)
+    raw.update(
+        badge={"label": "Under Contract"},
+        inspections=[{"startTime": "10:00", "endTime": None, "display": None}],
+    )
+    lazy = LazyListing(raw)
+    assert lazy == get_listing(raw) and get_listing(raw) == lazy
+    assert asdict(lazy) == asdict(get_listing(raw))
+    assert replace(lazy, price=1).price == 1
+
+
+def test_lazy_listing_parses_fields_on_first_access():
+    raw = make_listing(1)
+    listing = LazyListing(raw)
+    assert listing.price == 500000
+    raw["price"]["display"] = "$1m"
+    assert listing.price == 500000
+    assert "price" in listing.__dict__ and "images" not in listing.__dict__
+
+
+def test_search_lazy(fake_site):
+    api = fake_site(pages=2).install(RealestateComAu())
+    listings = api.search(lazy=True)
+    assert all(isinstance(listing, LazyListing) for listing in listings)
+    assert listings == api.search()
@@ -0,0 +1,50 @@
+import pickle
+
+import pytest
+
+from realestate_com_au.objects.listing import freeze_listing, get_listing
+from realestate_com_au.objects.listing_batch import ListingBatch
+
+from conftest import make_listing
+
+
+def get_listings(n=5):
+    raws = [make_listing(i, price=f"${i}00,000") for i in range(n)]
+    raws[0]["price"] = {"display": "Contact Agent"}
+    return [get_listing(raw) for raw in raws]
+
+
+def test_freeze_listing():
+    listing = get_listings(1)[0]
+    frozen = freeze_listing(listing)
+    assert not hasattr(frozen, "__dict__")
+    assert frozen.images[0].link == listing.images[0].link
+    assert pickle.loads(pickle.dumps(frozen)) == frozen
+    with pytest.raises(AttributeError):
+        frozen.price = 1
+
+
+def test_listing_batch_round_trips():
+    listings = get_listings()
+    batch = ListingBatch(listings)
+    assert len(batch) == 5
+    assert list(batch) == listings
+    assert batch.get_values("images", 2) == [listings[2].images[0].link]
+
+
+def test_listing_batch_to_pandas_shares_numeric_columns():
+    pytest.importorskip("pandas")
+    batch = ListingBatch(get_listings())
+    prices = batch.to_numpy("price")
+    assert prices[0] != prices[0] and prices[1] == 100000
+    df = batch.to_pandas()
+    assert df["price"].isna().sum() == 1
+    assert list(df.columns[:3]) == ["id", "badge", "url"]
+
+
+def test_listing_batch_to_arrow():
+    pytest.importorskip("pyarrow")
+    table = ListingBatch(get_listings()).to_arrow()
+    assert table.num_rows == 5
+    assert table.column("price").null_count == 1
+    assert table.column("listers").to_pylist()[0][0]["phone"] == "0400000"
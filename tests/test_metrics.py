@@ -0,0 +1,70 @@
+import pytest
+
+from realestate_com_au import RealestateComAu
+from realestate_com_au import scheduler as scheduler_module
+from realestate_com_au.cache import ResponseCache
+from realestate_com_au.metrics import Metrics, PrometheusMetrics
+from realestate_com_au.scheduler import RequestScheduler
+
+from conftest import FakeResponse
+
+
+class RecordingMetrics(Metrics):
+    def __init__(self):
+        self.fetched = []
+        self.parsed = []
+        self.retried = []
+
+    def page_fetched(self, stats):
+        self.fetched.append(stats)
+
+    def page_parsed(self, stats):
+        self.parsed.append(stats)
+
+    def request_retried(self, url, attempt, reason):
+        self.retried.append((attempt, reason))
+
+
+def test_search_reports_page_metrics(fake_site):
+    site = fake_site(pages=3)
+    metrics = RecordingMetrics()
+    api = site.install(RealestateComAu(cache=ResponseCache(), metrics=metrics))
+    api.search()
+    api.search(workers=2)
+
+    # Pages after the first are fetched concurrently, in any order
+    pages = [s.page for s in metrics.fetched]
+    assert pages[:4] == [1, 2, 3, 1] and sorted(pages[4:]) == [2, 3]
+    assert [s.cache_hit for s in metrics.fetched] == [False] * 3 + [True] * 3
+    first = metrics.fetched[0]
+    assert first.status_code == 200 and first.request_bytes and first.response_bytes
+    assert first.latency >= 0 and first.decode_seconds >= 0
+    assert [(s.page, s.listings) for s in metrics.parsed[:3]] == [
+        (1, 25),
+        (2, 25),
+        (3, 25),
+    ]
+
+
+def test_scheduler_reports_retries(monkeypatch):
+    monkeypatch.setattr(scheduler_module.time, "sleep", lambda seconds: None)
+    responses = [FakeResponse({}, 429), FakeResponse({"ok": True})]
+    metrics = RecordingMetrics()
+    scheduler = RequestScheduler(rate=100, metrics=metrics)
+    scheduler.request(lambda url, **kwargs: responses.pop(0), "https://lexa.test/")
+    assert metrics.retried == [(1, 429)]
+
+
+def test_prometheus_metrics(fake_site):
+    prometheus_client = pytest.importorskip("prometheus_client")
+    registry = prometheus_client.CollectorRegistry()
+    site = fake_site(pages=2)
+    api = site.install(RealestateComAu(metrics=PrometheusMetrics(registry)))
+    api.search()
+
+    def get(name):
+        return registry.get_sample_value(name, {"channel": "buy"})
+
+    assert get("realestate_com_au_listings_parsed_total") == 50
+    assert get("realestate_com_au_page_fetch_seconds_count") == 2
+    assert get("realestate_com_au_response_bytes_total") > 0
@@ -0,0 +1,141 @@
+import concurrent.futures
+import json
+import threading
+
+import pytest
+
+from realestate_com_au import RealestateComAu
+from realestate_com_au.objects.listing_batch import ListingBatch
+from realestate_com_au.pipeline import parse_body
+from realestate_com_au.query import SearchQuery
+from realestate_com_au.utils import RateLimiter
+
+from conftest import FakeResponse, make_listing, make_search_response
+
+
+def test_parse_body():
+    body = json.dumps(make_search_response("buy", [make_listing(1)], 1, 1)).encode()
+    parsed = parse_body(SearchQuery(), body, "json")
+    assert [listing.id for listing in parsed.items] == ["1"]
+    assert isinstance(parse_body(SearchQuery(), body, batch=True).items, ListingBatch)
+
+    miss = json.dumps({"errors": [{"message": "PersistedQueryNotFound"}]})
+    assert parse_body(SearchQuery(persisted_query=True), miss) is None
+
+
+def test_search_with_parse_processes(fake_site):
+    site = fake_site(pages=4)
+    api = site.install(RealestateComAu())
+    expected = api.search()
+    assert api.search(workers=2, parse_processes=2) == expected
+
+    batches = list(api.search_batches(workers=2, parse_processes=2))
+    assert all(isinstance(batch, ListingBatch) for batch in batches)
+    assert [listing.id for batch in batches for listing in batch] == [
+        listing.id for listing in expected
+    ]
+
+
+def test_parse_processes_do_not_block_fetching(fake_site, monkeypatch):
+    site = fake_site(pages=5)
+    api = site.install(RealestateComAu())
+
+    class FakeParsePool:
+        """Parses only once every page after the first has been submitted."""
+
+        def __init__(self, max_workers, mp_context):
+            self.submitted = []
+            self.timed_out = False
+            # Fails the test instead of hanging it if fetching waits on parsing
+            self.timer = threading.Timer(5, self.time_out)
+
+        def __enter__(self):
+            self.timer.start()
+            return self
+
+        def __exit__(self, *exc_info):
+            self.timer.cancel()
+
+        def submit(self, fn, *args):
+            future = concurrent.futures.Future()
+            self.submitted.append((future, fn, args))
+            if len(self.submitted) == site.pages - 1 or self.timed_out:
+                self.parse()
+            return future
+
+        def time_out(self):
+            self.timed_out = True
+            self.parse()
+
+        def parse(self):
+            for future, fn, args in self.submitted:
+                if not future.done():
+                    future.set_result(fn(*args))
+
+    pools = []
+    monkeypatch.setattr(
+        concurrent.futures,
+        "ProcessPoolExecutor",
+        lambda **kwargs: pools.append(FakeParsePool(**kwargs)) or pools[-1],
+    )
+    listings = api.search(parse_processes=4)
+    assert len(listings) == 125
+    assert not pools[0].timed_out
+
+
+def test_search_batches_fetches_a_bounded_window_ahead(fake_site):
+    site = fake_site(pages=20)
+    api = site.install(RealestateComAu())
+    batches = api.search_batches(workers=1)
+    next(batches), next(batches)
+    # Page 1, then a window of two pages, refilled once page 2 was taken
+    assert len(site.requested) <= 4
+    batches.close()
+
+
+@pytest.mark.parametrize("parse_processes", [None, 2])
+def test_persisted_query_retries_are_rate_limited(
+    fake_site, monkeypatch, parse_processes
+):
+    monkeypatch.setattr(  # parse in threads, so the test can patch RateLimiter
+        concurrent.futures,
+        "ProcessPoolExecutor",
+        lambda max_workers, mp_context: concurrent.futures.ThreadPoolExecutor(),
+    )
+    site = fake_site(pages=3)
+    api = site.install(RealestateComAu())
+    waits = []
+    monkeypatch.setattr(RateLimiter, "wait", lambda self: waits.append(self))
+    documents = []
+
+    def post(uri, **kwargs):
+        payload = json.loads(kwargs["data"])
+        documents.append("query" in payload)
+        if "query" not in payload:
+            return FakeResponse({"errors": [{"message": "PersistedQueryNotFound"}]})
+        return site.post(uri, **kwargs)
+
+    api._post = post
+    listings = api.search(
+        workers=2,
+        persisted_query=True,
+        requests_per_second=100,
+        parse_processes=parse_processes,
+    )
+    assert len(listings) == 75
+    assert sorted(documents) == [False] * 3 + [True] * 3
+    assert len(waits) == 6
+
+
+def test_single_worker_keeps_request_delay(fake_site):
+    site = fake_site(pages=3)
+    api = RealestateComAu()
+    evades = []
+
+    def post(uri, **kwargs):
+        evades.append(kwargs.get("evade"))
+        return site.post(uri, **kwargs)
+
+    api._post = post
+    list(api.search_batches(workers=1))
+    assert evades == [None, None, None]
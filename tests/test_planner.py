@@ -0,0 +1,131 @@
+import json
+from dataclasses import replace
+
+from realestate_com_au import RealestateComAu
+from realestate_com_au.planner import split_query
+from realestate_com_au.query import SearchQuery
+
+from conftest import FakeResponse, make_listing, make_search_response
+
+
+def test_split_query_order():
+    query = SearchQuery(locations=["a", "b"])
+    low, high = split_query(query)
+    assert (low.min_price, low.max_price, high.min_price) == (0, 20000000, 20000001)
+
+    narrow = SearchQuery(min_price=100000, max_price=105000, locations=["a", "b"])
+    studio, rest = split_query(narrow)
+    assert (studio.max_bedrooms, rest.min_bedrooms) == (0, 1)
+
+    single = SearchQuery(
+        min_price=100000, max_price=105000, min_bedrooms=2, max_bedrooms=2
+    )
+    assert split_query(replace(single, locations=["a", "b"]))[1].locations == ["b"]
+    assert split_query(single) is None
+
+
+def test_search_all_splits_capped_searches():
+    catalogue = [make_listing(i, price=f"${100000 + i * 10000:,}") for i in range(300)]
+    max_page = 2
+    requested = []
+
+    def post(uri, evade=None, **kwargs):
+        variables = json.loads(json.loads(kwargs["data"])["variables"]["query"])
+        price_range = variables["filters"].get("priceRange", {})
+        low = int(price_range.get("minimum", 0))
+        high = int(price_range.get("maximum", 10**12))
+        matches = [
+            item
+            for i, item in enumerate(catalogue)
+            if low <= 100000 + i * 10000 <= high
+        ]
+        page, page_size = variables["page"], variables["pageSize"]
+        requested.append(page)
+        items = (
+            matches[(page - 1) * page_size : page * page_size]
+            if page <= max_page
+            else []
+        )
+        data = make_search_response("buy", items, page, max_page, page_size)
+        results = data["data"]["buySearch"]["results"]
+        results["totalResultsCount"] = len(matches)
+        results["pagination"]["maxPageNumberAvailable"] = min(
+            max_page, -(-len(matches) // page_size)
+        )
+        results["pagination"]["moreResultsAvailable"] = page * page_size < len(matches)
+        return FakeResponse(data)
+
+    api = RealestateComAu()
+    api._post = post
+    assert len(api.search(limit=-1, workers=2)) < 300
+
+    listings = api.search_all(workers=4, max_results=None)
+    assert sorted(int(l.id) for l in listings) == list(range(300))
+
+
+def test_search_all_reports_unsplittable_capped_searches(fake_site, caplog):
+    site = fake_site(pages=2)
+    api = site.install(RealestateComAu())
+    incomplete = []
+    listings = api.search_all(
+        min_price=100000,
+        max_price=105000,
+        min_bedrooms=2,
+        max_bedrooms=2,
+        max_results=10,
+        incomplete=incomplete,
+    )
+    assert len(listings) == 50
+    [(query, total)] = incomplete
+    assert (query.min_price, query.max_price, total) == (100000, 105000, 50)
+    assert "cannot be split further" in caplog.text
+
+
+def test_search_all_fetches_unpriced_listings_after_splitting_by_price():
+    priced = {i: 100000 + i * 10000 for i in range(200)}
+    catalogue = [
+        make_listing(i, price=f"${priced[i]:,}" if i in priced else "Contact agent")
+        for i in range(280)
+    ]
+    max_page, page_size = 2, 25
+
+    def post(uri, evade=None, **kwargs):
+        variables = json.loads(json.loads(kwargs["data"])["variables"]["query"])
+        filters = variables["filters"]
+        price_range = filters.get("priceRange")
+        beds_range = filters.get("bedroomsRange", {})
+        low_beds = int(beds_range.get("minimum", 0))
+        high_beds = int(beds_range.get("maximum", 100))
+        matches = []
+        for i, item in enumerate(catalogue):
+            if not low_beds <= i % 7 <= high_beds:
+                continue
+            if i not in priced:
+                if price_range is not None or filters["excludeNoSalePrice"]:
+                    continue
+            elif price_range is not None:
+                low = int(price_range.get("minimum", 0))
+                if not low <= priced[i] <= int(price_range.get("maximum", 10**12)):
+                    continue
+            matches.append(item)
+        page = variables["page"]
+        items = (
+            matches[(page - 1) * page_size : page * page_size]
+            if page <= max_page
+            else []
+        )
+        data = make_search_response("buy", items, page, max_page, page_size)
+        results = data["data"]["buySearch"]["results"]
+        results["totalResultsCount"] = len(matches)
+        results["pagination"]["moreResultsAvailable"] = page * page_size < len(matches)
+        return FakeResponse(data)
+
+    api = RealestateComAu()
+    api._post = post
+    incomplete = []
+    listings = api.search_all(workers=4, incomplete=incomplete)
+    assert sorted(int(l.id) for l in listings) == list(range(280))
+    assert incomplete == []
+
+    listings = api.search_all(workers=4, exclude_no_sale_price=True)
+    assert sorted(int(l.id) for l in listings) == list(range(200))
@@ -0,0 +1,75 @@
+import json
+import pytest
+
+from realestate_com_au import RealestateComAu
+from realestate_com_au.graphql import searchBuy
+from realestate_com_au.graphql.projection import build_query, get_query_hash
+from realestate_com_au.objects.listing import get_listing_paths
+from realestate_com_au.query import SearchQuery
+
+from conftest import FakeResponse
+
+
+@pytest.mark.parametrize("channel", ["buy", "rent", "sold"])
+def test_build_query_keeps_only_requested_fields(channel):
+    query = build_query(channel, get_listing_paths(["suburb", "price"]))
+    assert f"{channel}Search(query:$query" in query
+    assert "suburb" in query and "price{display}" in query
+    assert "maxPageNumberAvailable" in query and "totalResultsCount" in query
+    assert "leadGen" not in query and "description" not in query
+    assert "fragment" not in query and "__typename" not in query
+    assert query.count("{") == query.count("}")
+    assert len(query) < len(searchBuy.QUERY) / 5
+
+
+def test_build_query_is_cached():
+    fields = get_listing_paths(["bedrooms"])
+    assert build_query("buy", fields) is build_query("buy", fields)
+
+
+def test_get_listing_paths_rejects_unknown_fields():
+    with pytest.raises(ValueError):
+        get_listing_paths(["bedrooms", "pool"])
+
+
+def test_unrequested_fields_keep_missing_values(fake_site):
+    site = fake_site(pages=1)
+
+    def post(uri, evade=None, **kwargs):
+        response = site.post(uri, **kwargs)
+        data = response.json()
+        for item in data["data"]["buySearch"]["results"]["exact"]["items"]:
+            item["listing"] = {
+                "id": item["listing"]["id"],
+                "address": {"suburb": item["listing"]["address"]["suburb"]},
+            }
+        return FakeResponse(data)
+
+    api = RealestateComAu()
+    api._post = post
+    for lazy in (False, True):
+        listing = api.search(fields=["suburb"], lazy=lazy)[0]
+        assert listing.suburb == "Seventeen Seventy"
+        assert (listing.price, listing.bedrooms, listing.url) == (None, None, None)
+        assert (listing.images, listing.listers, listing.land_size) == ([], [], -1.0)
+
+
+def test_persisted_query_falls_back_to_document(fake_site):
+    site = fake_site(pages=1)
+    payloads = []
+
+    def post(uri, evade=None, **kwargs):
+        payloads.append(json.loads(kwargs["data"]))
+        if "query" not in payloads[-1]:
+            return FakeResponse({"errors": [{"message": "PersistedQueryNotFound"}]})
+        return site.post(uri, **kwargs)
+
+    api = RealestateComAu()
+    api._post = post
+    listings = api.search(fields=["suburb"], persisted_query=True)
+    assert len(listings) == 25
+    document = SearchQuery(fields=("suburb",)).get_query()
+    assert [p["extensions"]["persistedQuery"]["sha256Hash"] for p in payloads] == [
+        get_query_hash(document)
+    ] * 2
+    assert payloads[1]["query"] == document
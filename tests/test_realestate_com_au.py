@@ -1,10 +1,144 @@
+import json
+import logging
 import os
+import subprocess
 import sys
 import pytest
 
 from realestate_com_au import RealestateComAu
+from realestate_com_au.objects.listing import LazyListing
 
 
 def test_constructor():
     api = RealestateComAu()
     assert api
+
+
+def test_debug_is_per_client(fake_site, caplog):
+    caplog.set_level(logging.DEBUG, logger="realestate_com_au")
+    site = fake_site(pages=1)
+    quiet = site.install(RealestateComAu())
+    quiet.search()
+    assert not caplog.records
+
+    loud = site.install(RealestateComAu(debug=True))
+    loud.search()
+    quiet.search()
+    [record] = caplog.records
+    assert record.getMessage().startswith("buy page 1: HTTP 200")
+    assert record.client == f"{id(loud):x}"
+    assert not logging.getLogger("realestate_com_au.realestate_com_au").handlers
+
+
+def test_import_is_lazy():
+    # A fresh interpreter, as this one has already imported everything
+    code = """
+import sys
+import realestate_com_au
+from realestate_com_au.query import SearchQuery
+
+realestate_com_au.RealestateComAu()
+SearchQuery(channel="buy").get_payload(1)
+print(" ".join(sys.modules))
+"""
+    modules = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout.split()
+    assert "realestate_com_au.graphql.searchBuy" in modules
+    for module in (
+        "requests",
+        "multiprocessing",
+        "sqlite3",
+        "realestate_com_au.graphql.searchRent",
+        "realestate_com_au.graphql.searchSold",
+    ):
+        assert module not in modules
+
+
+def test_search_sequential(fake_site):
+    site = fake_site(pages=3)
+    api = site.install(RealestateComAu())
+    listings = api.search(locations=["seventeen seventy, qld 4677"])
+    assert [listing.id for listing in listings] == [str(i) for i in range(75)]
+    assert site.requested == [1, 2, 3]
+
+
+def test_search_concurrent_matches_sequential(fake_site):
+    site = fake_site(pages=5)
+    api = site.install(RealestateComAu())
+    sequential = api.search(locations=["seventeen seventy, qld 4677"])
+    concurrent = api.search(locations=["seventeen seventy, qld 4677"], workers=4)
+    assert [l.id for l in concurrent] == [l.id for l in sequential]
+    assert sorted(site.requested[5:]) == [1, 2, 3, 4, 5]
+
+
+def test_search_concurrent_respects_limit(fake_site):
+    site = fake_site(pages=10, page_size=10)
+    api = site.install(RealestateComAu())
+    listings = api.search(limit=30, workers=4)
+    assert len(listings) == 30
+    assert sorted(site.requested) == [1, 2, 3]
+
+
+def test_iter_search_stops_requesting_when_abandoned(fake_site):
+    site = fake_site(pages=5)
+    api = site.install(RealestateComAu())
+    listings = api.iter_search(locations=["seventeen seventy, qld 4677"])
+    first = [next(listings) for _ in range(30)]
+    assert [listing.id for listing in first] == [str(i) for i in range(30)]
+    assert site.requested == [1, 2]
+
+
+def test_iter_search_pages(fake_site):
+    site = fake_site(pages=3)
+    api = site.install(RealestateComAu())
+    pages = list(api.iter_search(pages=True))
+    assert [len(page) for page in pages] == [25, 25, 25]
+
+
+def test_fetch_options_are_rejected_clearly(fake_site):
+    api = fake_site().install(RealestateComAu())
+    with pytest.raises(TypeError, match=r"iter_search\(\) does not take workers"):
+        next(api.iter_search(workers=2))
+    with pytest.raises(TypeError, match="parse_processes"):
+        api.search_many([{"parse_processes": 2}])
+
+
+def test_search_many_shares_overlapping_listings(fake_site):
+    site = fake_site(pages=2)
+    api = site.install(RealestateComAu())
+    result = api.search_many(
+        [
+            {"locations": ["agnes water, qld 4677"]},
+            {"locations": ["seventeen seventy, qld 4677"]},
+        ],
+        workers=2,
+    )
+    first, second = result.results
+    assert [l.id for l in first] == [l.id for l in second]
+    assert all(a is b for a, b in zip(first, second))
+    assert len(result.listings) == 50
+
+
+def test_search_many_shares_listings_by_projection(fake_site):
+    class ProjectingSite(fake_site):
+        """Like the server, leaves out addresses the query document does not select"""
+
+        def post(self, uri, **kwargs):
+            self.trimmed = "suburb" not in json.loads(kwargs["data"])["query"]
+            return super().post(uri, **kwargs)
+
+        def page_items(self, page):
+            items = super().page_items(page)
+            return (
+                [{**item, "address": {}} for item in items] if self.trimmed else items
+            )
+
+    api = ProjectingSite(pages=1).install(RealestateComAu())
+    projected, full, full_again, lazy = api.search_many(
+        [{"fields": ["price"]}, {}, {}, {"lazy": True}], workers=1
+    ).results
+    assert [l.suburb for l in projected] == [None] * 25
+    assert [l.suburb for l in full] == ["Seventeen Seventy"] * 25
+    assert all(a is b for a, b in zip(full, full_again))
+    assert all(type(l) is LazyListing for l in lazy)
@@ -0,0 +1,117 @@
+import pytest
+import requests
+
+from realestate_com_au import RealestateComAu
+from realestate_com_au import scheduler as scheduler_module
+from realestate_com_au.scheduler import ProxyPool, RequestScheduler, TokenBucket
+
+from conftest import FakeResponse
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(scheduler_module.time, "sleep", sleeps.append)
+    return sleeps
+
+
+def test_scheduler_retries_throttled_requests(no_sleep):
+    responses = [
+        FakeResponse({}, 429, {"retry-after": "3"}),
+        FakeResponse({}, 503),
+        FakeResponse({"ok": True}),
+    ]
+    calls = []
+
+    def send(url, **kwargs):
+        calls.append(kwargs)
+        return responses.pop(0)
+
+    scheduler = RequestScheduler(rate=100, user_agents=["a", "b"])
+    res = scheduler.request(send, "https://lexa.realestate.com.au/graphql")
+    assert res.json() == {"ok": True}
+    assert len(calls) == 3 and no_sleep[0] == 3
+    assert all(call["headers"]["user-agent"] in ("a", "b") for call in calls)
+    assert scheduler.get_bucket("https://lexa.realestate.com.au/x").rate < 100
+
+
+def test_scheduler_raises_after_retries():
+    def send(url, **kwargs):
+        raise requests.ConnectionError("down")
+
+    with pytest.raises(requests.ConnectionError):
+        RequestScheduler(max_retries=2, rate=100).request(send, "https://a.test")
+
+
+def test_proxy_pool_benches_throttled_proxies():
+    pool = ProxyPool([{"https": "http://p1"}, {"https": "http://p2"}])
+    first, second = pool.entries
+    pool.report(first, ok=False, throttled=True)
+    assert all(pool.acquire() is second for _ in range(20))
+
+
+def test_scheduler_benches_blocked_proxies():
+    pool = ProxyPool([{"https": "http://p1"}, {"https": "http://p2"}])
+    used = []
+
+    def send(url, **kwargs):
+        used.append(kwargs["proxies"])
+        return FakeResponse({}, 403)
+
+    res = RequestScheduler(rate=100, proxy_pool=pool).request(send, "https://a.test")
+    assert res.status_code == 403 and len(used) == 1
+    (blocked,) = [e for e in pool.entries if e["proxies"] is used[0]]
+    (other,) = [e for e in pool.entries if e is not blocked]
+    assert blocked["banned_until"] and not other["banned_until"]
+
+
+def test_scheduler_retries_direct_after_proxy():
+    pool = ProxyPool([{"https": "http://p1"}, None])
+    proxy, direct = pool.entries
+    entries = iter([proxy, direct])
+    pool.acquire = lambda: next(entries)
+    responses = [FakeResponse({}, 503), FakeResponse({"ok": True})]
+    used = []
+
+    def send(url, **kwargs):
+        used.append(kwargs.get("proxies"))
+        return responses.pop(0)
+
+    RequestScheduler(rate=100, proxy_pool=pool).request(send, "https://a.test")
+    assert used == [{"https": "http://p1"}, None]
+
+
+def test_proxy_pool_benches_slow_proxies():
+    pool = ProxyPool([{"https": "http://slow"}, {"https": "http://fast"}])
+    slow, fast = pool.entries
+    for _ in range(10):
+        pool.report(slow, ok=True, elapsed=pool.slow_seconds + 1)
+        pool.report(fast, ok=True, elapsed=1)
+    assert slow["banned_until"] and not fast["banned_until"]
+
+
+def test_token_bucket_adapts_rate():
+    bucket = TokenBucket(rate=4, min_rate=1)
+    bucket.throttled()
+    bucket.throttled()
+    bucket.throttled()
+    assert bucket.rate == 1
+    bucket.succeeded()
+    assert bucket.rate == 1.05
+
+
+def test_search_resumes_at_failed_page(fake_site):
+    site = fake_site(pages=3)
+    failures = {2: 2}
+
+    def send(url, **kwargs):
+        page = len(site.requested) + 1
+        if failures.get(page):
+            failures[page] -= 1
+            return FakeResponse({}, 502)
+        return site.post(url, **kwargs)
+
+    api = RealestateComAu(scheduler=RequestScheduler(rate=100))
+    api.session.post = send
+    assert len(api.search()) == 75
+    assert site.requested == [1, 2, 3]
@@ -0,0 +1,54 @@
+from realestate_com_au.query import SearchQuery
+from realestate_com_au.store import ListingStore
+
+from conftest import make_listing, make_search_response
+
+
+def parse(raw_listings):
+    data = make_search_response("buy", raw_listings, 1, 1)
+    return SearchQuery().parse_items(data)
+
+
+def test_store_upserts_by_id(tmp_path):
+    store = ListingStore(str(tmp_path / "listings.sqlite"))
+    listings = parse([make_listing(1), make_listing(2)])
+    store.upsert(listings)
+    store.upsert(parse([make_listing(2, price="$650,000")]))
+    assert len(store) == 2
+    assert store.get("1") == listings[0]
+    assert store.get("2").price == 650000
+
+    store = ListingStore(str(tmp_path / "listings.sqlite"))
+    assert store.get("1") == listings[0]
+
+
+def test_store_query_filters():
+    store = ListingStore()
+    store.upsert(
+        parse(
+            [
+                make_listing(1, "Ocean views and a pool", price="$400,000"),
+                make_listing(2, "Renovated kitchen, ocean glimpses", price="$600,000"),
+                make_listing(3, "Pool and shed", price="$800,000"),
+            ]
+        )
+    )
+
+    def ids(**kwargs):
+        return [listing.id for listing in store.query(**kwargs)]
+
+    assert ids(min_price=500000) == ["2", "3"]
+    assert ids(max_price=600000, sort_type="price-desc") == ["2", "1"]
+    assert ids(keywords=["pool"]) == ["1", "3"]
+    assert ids(keywords=["ocean", "pool"]) == ["1"]
+    assert ids(exclude_keywords=["pool", "shed"]) == ["2"]
+    assert ids(postcodes=["4677"], property_types=["house"], min_bedrooms=3) == [
+        "1",
+        "2",
+        "3",
+    ]
+    assert ids(max_bedrooms=2) == []
+    assert ids(limit=1) == ["1"]
+
+    store.upsert(parse([make_listing(1, "Tiny cottage", price="$400,000")]))
+    assert ids(keywords=["pool"]) == ["3"]
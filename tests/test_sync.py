@@ -0,0 +1,54 @@
+from realestate_com_au import RealestateComAu
+from realestate_com_au.sync import ListingIndex
+
+from conftest import make_listing
+
+
+def test_sync_reports_changes(fake_site):
+    site = fake_site(pages=2)
+    api = site.install(RealestateComAu())
+    index = ListingIndex()
+
+    first = api.sync(index, locations=["seventeen seventy, qld 4677"])
+    assert len(first.added) == 50 and not first.changed and not first.removed
+
+    site.pages = 1
+    page_items = site.page_items
+    site.page_items = lambda page: [
+        make_listing(item["id"], price="$600,000") if item["id"] == "3" else item
+        for item in page_items(page)
+    ] + [make_listing("new")]
+    second = api.sync(index, locations=["seventeen seventy, qld 4677"])
+    assert [l.id for l in second.added] == ["new"]
+    assert [l.id for l in second.changed] == ["3"]
+    assert sorted(second.removed, key=int) == [str(i) for i in range(25, 50)]
+    assert second.unchanged_count == 24
+
+
+def test_sync_sold_newest_first_stops_at_seen(fake_site):
+    site = fake_site(pages=4, channel="sold")
+    api = site.install(RealestateComAu())
+    index = ListingIndex()
+    api.sync(index, channel="sold", sort_type="new-desc")
+
+    site.requested = []
+    result = api.sync(index, channel="sold", sort_type="new-desc")
+    assert site.requested == [1]
+    assert not result.complete and not result.removed
+
+
+def test_sync_with_limit_does_not_report_removed(fake_site):
+    site = fake_site(pages=3)
+    api = site.install(RealestateComAu())
+    index = ListingIndex()
+    catalogue = list(range(75))
+    site.page_items = lambda page: [
+        make_listing(i) for i in catalogue[(page - 1) * 25 : page * 25]
+    ]
+    first = api.sync(index, limit=30)  # pages 1 and 2: listings 0-49
+    assert len(first.added) == 50
+
+    catalogue.insert(0, "new")  # pushes listing 49 onto page 3
+    second = api.sync(index, limit=30)
+    assert [l.id for l in second.added] == ["new"]
+    assert not second.complete and not second.removed